@@ -0,0 +1,147 @@
+"""
+Buffered audit logging
+
+Best-effort audit events (logins, logouts) are collected in memory and
+written in batches by a background thread with a single multi-row INSERT,
+instead of one INSERT and commit per request. Security-relevant events
+(password changes, account (de)activation) are still written synchronously
+via auth.create_audit_log().
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert
+
+from .models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Flush every AUDIT_FLUSH_INTERVAL seconds or once AUDIT_BATCH_SIZE rows are queued
+AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', '0.1'))
+AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', '200'))
+
+
+class AuditLogBuffer:
+    """
+    Thread-safe buffer for audit log rows with a background flusher.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        batch_size: int = AUDIT_BATCH_SIZE
+    ):
+        """
+        Initialize audit log buffer
+
+        Args:
+            flush_interval: Seconds between background flushes
+            batch_size: Number of queued rows that triggers an early flush
+        """
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._rows: deque = deque()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def add(
+        self,
+        user_id: int,
+        action: str,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[int] = None,
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ):
+        """
+        Queue an audit log entry
+
+        Args:
+            user_id: User ID
+            action: Action performed
+            resource_type: Type of resource affected
+            resource_id: ID of resource affected
+            details: Additional details
+            ip_address: Client IP address
+            user_agent: Client user agent
+        """
+        self._rows.append({
+            'user_id': user_id,
+            'action': action,
+            'resource_type': resource_type,
+            'resource_id': resource_id,
+            'details': details,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'created_at': datetime.utcnow(),
+        })
+        self._ensure_thread()
+        if len(self._rows) >= self._batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write all queued entries with one multi-row INSERT
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            rows = []
+            while self._rows:
+                rows.append(self._rows.popleft())
+            if not rows:
+                return 0
+
+            from .database import get_db_context
+            try:
+                with get_db_context() as db:
+                    db.execute(insert(AuditLog), rows)
+            except Exception as e:
+                logger.error(f"Failed to write {len(rows)} audit log entries: {e}")
+                return 0
+            return len(rows)
+
+    def _ensure_thread(self):
+        """Start the background flusher on first use"""
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="audit_flusher",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        """Background loop flushing the buffer periodically"""
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+# Global instance
+_audit_buffer: Optional[AuditLogBuffer] = None
+_audit_buffer_lock = threading.Lock()
+
+
+def get_audit_buffer() -> AuditLogBuffer:
+    """Get global audit log buffer instance"""
+    global _audit_buffer
+    if _audit_buffer is None:
+        with _audit_buffer_lock:
+            if _audit_buffer is None:
+                _audit_buffer = AuditLogBuffer()
+                atexit.register(_audit_buffer.flush)
+    return _audit_buffer
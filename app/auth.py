@@ -2,7 +2,7 @@
 Authentication module with JWT token support
 
 This module provides complete authentication functionality including:
-- Password hashing with bcrypt
+- Password hashing with Argon2id (legacy bcrypt hashes still verify)
 - JWT token generation and validation
 - User login/logout
 - User registration with email validation
@@ -11,19 +11,30 @@ This module provides complete authentication functionality including:
 - Audit logging for all authentication actions
 """
 import os
+import logging
+import re
 import secrets
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import bcrypt
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import bindparam, or_, select
 
 from .models.user import User
 from .models.audit_log import AuditLog
 from .models.password_reset import PasswordReset
 from .utils.validators import validate_email, validate_password, validate_username
+from .utils.helpers import hash_token
 from .dto import UserDTO
+from .audit_buffer import get_audit_buffer
+from .auth_cache import forget_user
+
+logger = logging.getLogger(__name__)
 
 
 # JWT Configuration from environment
@@ -31,6 +42,63 @@ JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-producti
 JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', '24'))
 
+# Reusable JWT codec - avoids rebuilding options and algorithm lists per call
+_jwt = jwt.PyJWT(options={'require': ['exp']})
+_JWT_ALGORITHMS = (JWT_ALGORITHM,)
+_JWT_SKIP_EXP = {'verify_exp': False}
+
+# Key for fingerprinting tokens stored in the database (derived from JWT secret)
+TOKEN_HASH_KEY = bytes.fromhex(hash_token(JWT_SECRET_KEY))
+
+# Structure of a compact JWS (header.payload.signature) - checked before any
+# hashing or signature work so garbage cookies are rejected cheaply
+_TOKEN_RE = re.compile(r'[A-Za-z0-9_-]{10,512}\.[A-Za-z0-9_-]{10,4096}\.[A-Za-z0-9_-]{10,512}')
+
+# Verified token payloads: token fingerprint -> payload. A token's signature
+# never changes, so it only needs to be checked once; expiry is still checked.
+JWT_PAYLOAD_CACHE_MAX_SIZE = 20000
+_jwt_payload_cache: Dict[str, Dict[str, Any]] = {}
+_jwt_payload_cache_lock = threading.Lock()
+
+# Format of the stored reset token fingerprints, see hash_token()
+_TOKEN_FINGERPRINT_RE = re.compile(r'[0-9a-f]{64}')
+
+# Default admin account created on first startup
+DEFAULT_ADMIN_USERNAME = 'user500'
+
+# UserDTO of the default admin as loaded or created by create_admin_user();
+# dropped when the account is activated or deactivated
+_admin_dto: Optional[UserDTO] = None
+
+# Argon2id parameters (OWASP recommendation: 46 MiB, 3 iterations, 1 lane)
+ARGON2_MEMORY_KB = int(os.getenv('ARGON2_M_KB', str(46 * 1024)))
+ARGON2_TIME_COST = int(os.getenv('ARGON2_T', '3'))
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_P', '1'))
+
+_password_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_KB,
+    parallelism=ARGON2_PARALLELISM
+)
+
+
+# Prebuilt user lookup statements - built once so every call hits
+# SQLAlchemy's compiled statement cache without rebuilding an ORM query
+_USER_BY_ID_STMT = select(User).where(User.id == bindparam('id'))
+
+# Plain column rows (no ORM instance) in UserDTO.COLUMNS order for UserDTO.from_row
+_USER_DTO_ROW_BY_ID_STMT = select(
+    *(getattr(User, name) for name in UserDTO.COLUMNS)
+).where(User.id == bindparam('id'))
+
+_USER_DTO_ROW_BY_USERNAME_STMT = select(
+    *(getattr(User, name) for name in UserDTO.COLUMNS)
+).where(User.username == bindparam('username'))
+
+_USER_BY_USERNAME_OR_EMAIL_STMT = select(User).where(
+    or_(User.username == bindparam('login'), User.email == bindparam('login'))
+)
+
 
 class AuthError(Exception):
     """Base exception for authentication errors"""
@@ -62,9 +130,14 @@ class InactiveUserError(AuthError):
     pass
 
 
+def _is_bcrypt_hash(password_hash: str) -> bool:
+    """Check if a stored hash was created by bcrypt"""
+    return password_hash.startswith(('$2a$', '$2b$', '$2y$'))
+
+
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt
+    Hash a password using Argon2id
 
     Args:
         password: Plain text password
@@ -72,16 +145,15 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password as string
     """
-    # Generate salt and hash password
-    salt = bcrypt.gensalt()
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return password_hash.decode('utf-8')
+    return _password_hasher.hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
     """
     Verify a password against its hash
 
+    Supports Argon2id hashes and legacy bcrypt hashes.
+
     Args:
         password: Plain text password
         password_hash: Hashed password
@@ -89,12 +161,35 @@ def verify_password(password: str, password_hash: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    if not password_hash:
+        return False
+
     try:
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
-    except Exception:
+        if _is_bcrypt_hash(password_hash):
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        return _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError, ValueError):
         return False
 
 
+def password_needs_rehash(password_hash: str) -> bool:
+    """
+    Check if a password hash should be upgraded to the current parameters
+
+    Args:
+        password_hash: Hashed password
+
+    Returns:
+        True for bcrypt hashes and Argon2 hashes with outdated parameters
+    """
+    if _is_bcrypt_hash(password_hash):
+        return True
+    try:
+        return _password_hasher.check_needs_rehash(password_hash)
+    except InvalidHashError:
+        return True
+
+
 def generate_jwt_token(user) -> str:
     """
     Generate JWT token for user
@@ -110,6 +205,7 @@ def generate_jwt_token(user) -> str:
 
     # Token payload - works with both User model and UserDTO
     payload = {
+        'sub': str(user.id),
         'user_id': user.id,
         'username': user.username,
         'email': user.email,
@@ -120,16 +216,17 @@ def generate_jwt_token(user) -> str:
     }
 
     # Generate token
-    token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    token = _jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return token
 
 
-def validate_jwt_token(token: str) -> Dict[str, Any]:
+def validate_jwt_token(token: str, verify_exp: bool = True) -> Dict[str, Any]:
     """
     Validate and decode JWT token
 
     Args:
         token: JWT token string
+        verify_exp: Reject expired tokens
 
     Returns:
         Decoded token payload
@@ -137,20 +234,62 @@ def validate_jwt_token(token: str) -> Dict[str, Any]:
     Raises:
         InvalidTokenError: If token is invalid or expired
     """
+    if not is_well_formed_token(token):
+        raise InvalidTokenError("Malformed token")
+
+    key = hash_token(token, key=TOKEN_HASH_KEY)
+    payload = _jwt_payload_cache.get(key)
+    if payload is not None:
+        if verify_exp and payload['exp'] <= time.time():
+            raise InvalidTokenError("Token has expired")
+        return dict(payload)
+
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = _jwt.decode(
+            token,
+            JWT_SECRET_KEY,
+            algorithms=_JWT_ALGORITHMS,
+            options=None if verify_exp else _JWT_SKIP_EXP
+        )
 
         # Verify token type
         if payload.get('type') != 'access':
             raise InvalidTokenError("Invalid token type")
 
-        return payload
+        _cache_jwt_payload(key, payload)
+        return dict(payload)
     except jwt.ExpiredSignatureError:
         raise InvalidTokenError("Token has expired")
     except jwt.InvalidTokenError as e:
         raise InvalidTokenError(f"Invalid token: {str(e)}")
 
 
+def is_well_formed_token(token: str) -> bool:
+    """
+    Check that a string looks like a JWT, without decoding it
+
+    Args:
+        token: Token string
+
+    Returns:
+        True if the token has three base64url segments of sane length
+    """
+    return _TOKEN_RE.fullmatch(token) is not None
+
+
+def _cache_jwt_payload(key: str, payload: Dict[str, Any]):
+    """Remember a verified payload, dropping expired entries when the cache is full"""
+    with _jwt_payload_cache_lock:
+        if len(_jwt_payload_cache) >= JWT_PAYLOAD_CACHE_MAX_SIZE:
+            now = time.time()
+            expired = [k for k, p in _jwt_payload_cache.items() if p['exp'] <= now]
+            for k in expired:
+                del _jwt_payload_cache[k]
+            if not expired:
+                _jwt_payload_cache.clear()
+        _jwt_payload_cache[key] = payload
+
+
 def create_audit_log(
     db: Session,
     user_id: int,
@@ -309,81 +448,56 @@ def login_user(
     user_agent: Optional[str] = None
 ) -> tuple[UserDTO, str]:
     """
-    Login user and generate JWT token - SIMPLIFIED VERSION FOR DEBUGGING
-    """
-    import logging
-    logger = logging.getLogger(__name__)
+    Login user and generate JWT token
 
-    try:
-        logger.info("=== LOGIN START ===")
+    Args:
+        db: Database session
+        username_or_email: Username or email address
+        password: Plain text password
+        ip_address: Client IP address
+        user_agent: Client user agent
 
+    Returns:
+        Tuple of (UserDTO, JWT token)
+
+    Raises:
+        InvalidCredentialsError: If credentials are invalid
+        InactiveUserError: If user account is inactive
+    """
+    try:
         # Find user by username or email
-        user = db.query(User).filter(
-            or_(User.username == username_or_email, User.email == username_or_email)
-        ).first()
-        logger.info(f"Step 1: Found user")
+        user = db.execute(
+            _USER_BY_USERNAME_OR_EMAIL_STMT, {'login': username_or_email}
+        ).scalar_one_or_none()
 
         if not user:
             raise InvalidCredentialsError("Invalid username/email or password")
 
-        # Capture IMMEDIATELY after query
-        user_id = user.id
-        logger.info(f"Step 2: Captured user_id={user_id}")
-
-        username = user.username
-        logger.info(f"Step 3: Captured username={username}")
-
-        email = user.email
-        full_name = user.full_name
-        is_admin = user.is_admin
-        is_active = user.is_active
-        password_hash = user.password_hash
-        github_token_encrypted = user.github_token_encrypted
-        github_organization = user.github_organization
-        github_default_repo = user.github_default_repo
-        logger.info(f"Step 4: ALL attributes captured")
-
         # Verify password
-        if not verify_password(password, password_hash):
+        if not verify_password(password, user.password_hash):
             raise InvalidCredentialsError("Invalid username/email or password")
-        logger.info(f"Step 5: Password verified")
 
-        if not is_active:
+        if not user.is_active:
             raise InactiveUserError("User account is inactive")
-        logger.info(f"Step 6: Active check passed")
 
-        # DONT touch user object anymore! Just commit
-        last_login_time = datetime.utcnow()
-        logger.info(f"Step 7: About to update last_login - user object state: {db.is_modified(user)}")
+        # Upgrade legacy bcrypt or outdated Argon2 hashes on successful login
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
 
-        user.last_login = last_login_time
-        logger.info(f"Step 8: Set last_login")
+        user.last_login = datetime.utcnow()
 
         # NO audit log for now - just commit
-        logger.info(f"Step 9: About to commit")
         db.commit()
-        logger.info(f"Step 10: COMMITTED - user is now detached")
-
-        # Create DTO from captured values
-        user_dto = UserDTO(
-            id=user_id,
-            username=username,
-            email=email,
-            full_name=full_name,
-            is_admin=is_admin,
-            is_active=is_active,
-            last_login=last_login_time,
-            github_token_encrypted=github_token_encrypted,
-            github_organization=github_organization,
-            github_default_repo=github_default_repo
-        )
-        logger.info(f"Step 11: Created UserDTO")
+
+        # All columns were loaded by the query and expire_on_commit=False
+        # keeps them after commit - building the DTO needs no further I/O
+        user_dto = UserDTO.from_model(user)
 
         # Generate token
         token = generate_jwt_token(user_dto)
-        logger.info(f"Step 12: Generated token")
 
-        logger.info(f"Step 13: About to return")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("login_user: uid=%s", user_dto.id)
         return user_dto, token
 
     except Exception as e:
@@ -412,19 +526,36 @@ def logout_user(
         ip_address: Client IP address
         user_agent: Client user agent
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        # Capture username BEFORE auto_commit
-        username = user.username
-        create_audit_log(
-            db=db,
-            user_id=user_id,
-            action='logout',
-            details=f"User {username} logged out",
-            ip_address=ip_address,
-            user_agent=user_agent,
-            auto_commit=True
-        )
+    row = db.execute(_USER_DTO_ROW_BY_ID_STMT, {'id': user_id}).first()
+    if row:
+        record_logout(user_id, row.username, ip_address, user_agent)
+
+
+def record_logout(
+    user_id: int,
+    username: str,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None
+) -> None:
+    """
+    Queue the logout audit entry without touching the database
+
+    Used when the user is already known, e.g. from the session token's claims.
+
+    Args:
+        user_id: User ID
+        username: Username for the audit details
+        ip_address: Client IP address
+        user_agent: Client user agent
+    """
+    # Best-effort event - written in the next audit batch
+    get_audit_buffer().add(
+        user_id=user_id,
+        action='logout',
+        details=f"User {username} logged out",
+        ip_address=ip_address,
+        user_agent=user_agent
+    )
 
 
 def get_user_from_token(db: Session, token: str) -> UserDTO:
@@ -446,17 +577,57 @@ def get_user_from_token(db: Session, token: str) -> UserDTO:
     # Validate token
     payload = validate_jwt_token(token)
 
-    # Get user from database
-    user = db.query(User).filter(User.id == payload['user_id']).first()
+    return get_user_from_payload(db, payload)
 
-    if not user:
+
+def get_token_user_id(payload: Dict[str, Any]) -> int:
+    """
+    Get the user ID (primary key) from a validated JWT payload
+
+    Args:
+        payload: Payload returned by validate_jwt_token()
+
+    Returns:
+        User ID
+
+    Raises:
+        InvalidTokenError: If the token carries no user ID
+    """
+    # Tokens issued before the sub claim was added only carry user_id
+    try:
+        sub = payload.get('sub')
+        return int(sub) if sub is not None else int(payload['user_id'])
+    except (KeyError, TypeError, ValueError):
+        raise InvalidTokenError("Token has no user ID")
+
+
+def get_user_from_payload(db: Session, payload: Dict[str, Any]) -> UserDTO:
+    """
+    Get user from an already validated JWT payload
+
+    Args:
+        db: Database session
+        payload: Payload returned by validate_jwt_token()
+
+    Returns:
+        UserDTO object
+
+    Raises:
+        UserNotFoundError: If user not found
+        InactiveUserError: If user is inactive
+    """
+    # Get user from database - only the columns the DTO needs
+    row = db.execute(
+        _USER_DTO_ROW_BY_ID_STMT, {'id': get_token_user_id(payload)}
+    ).first()
+
+    if not row:
         raise UserNotFoundError("User not found")
 
-    if not user.is_active:
-        raise InactiveUserError("User account is inactive")
+    user_dto = UserDTO.from_row(row)
 
-    # Create UserDTO from the user model while still in session
-    user_dto = UserDTO.from_model(user)
+    if not user_dto.is_active:
+        raise InactiveUserError("User account is inactive")
 
     return user_dto
 
@@ -495,10 +666,10 @@ def generate_password_reset_token(
     # Generate secure random token
     token = secrets.token_urlsafe(32)
 
-    # Create password reset record
+    # Create password reset record - only a keyed hash of the token is stored
     password_reset = PasswordReset(
         user_id=user_id,
-        token=token
+        token=hash_token(token, key=TOKEN_HASH_KEY)
     )
     db.add(password_reset)
     db.commit()
@@ -531,9 +702,15 @@ def validate_password_reset_token(db: Session, token: str) -> PasswordReset:
     Raises:
         InvalidTokenError: If token is invalid or expired
     """
-    # Find token in database
+    # Find token in database (stored as keyed hash). Links sent before tokens
+    # were hashed still have the plain token stored; they are accepted until
+    # they expire (one release). A fingerprint itself is never accepted as a
+    # plain token, so leaked hashes can't be replayed.
+    candidates = [hash_token(token, key=TOKEN_HASH_KEY)]
+    if not _TOKEN_FINGERPRINT_RE.fullmatch(token):
+        candidates.append(token)
     password_reset = db.query(PasswordReset).filter(
-        PasswordReset.token == token
+        PasswordReset.token.in_(candidates)
     ).first()
 
     if not password_reset:
@@ -579,7 +756,9 @@ def reset_password(
         raise ValueError(f"Invalid password: {error}")
 
     # Get user
-    user = db.query(User).filter(User.id == password_reset.user_id).first()
+    user = db.execute(
+        _USER_BY_ID_STMT, {'id': password_reset.user_id}
+    ).scalar_one_or_none()
     if not user:
         raise UserNotFoundError("User not found")
 
@@ -638,7 +817,7 @@ def change_password(
         ValueError: If new password validation fails
     """
     # Get user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.execute(_USER_BY_ID_STMT, {'id': user_id}).scalar_one_or_none()
     if not user:
         raise UserNotFoundError("User not found")
 
@@ -672,7 +851,7 @@ def change_password(
     return user
 
 
-def create_admin_user(db: Session) -> User:
+def create_admin_user(db: Session) -> UserDTO:
     """
     Create the default admin user if it doesn't exist
 
@@ -683,18 +862,24 @@ def create_admin_user(db: Session) -> User:
         db: Database session
 
     Returns:
-        User object (existing or newly created)
+        UserDTO of the admin user (existing or newly created), cached per
+        process after the first call
     """
+    global _admin_dto
+    if _admin_dto is not None:
+        return _admin_dto
+
     # Check if admin user already exists
-    admin_user = db.query(User).filter(User.username == 'user500').first()
+    row = db.execute(_USER_DTO_ROW_BY_USERNAME_STMT, {'username': DEFAULT_ADMIN_USERNAME}).first()
 
-    if admin_user:
-        print("Admin user 'user500' already exists")
-        return admin_user
+    if row:
+        logger.info("Admin user 'user500' already exists")
+        _admin_dto = UserDTO.from_row(row)
+        return _admin_dto
 
     # Create admin user
     admin_user = User(
-        username='user500',
+        username=DEFAULT_ADMIN_USERNAME,
         email='admin@nx2git.local',
         password_hash=hash_password('Quaternion1234____'),
         full_name='Administrator',
@@ -717,16 +902,24 @@ def create_admin_user(db: Session) -> User:
         auto_commit=True
     )
 
-    print(f"Admin user created: username='user500', password='Quaternion1234____'")
-    return admin_user
+    logger.info("Admin user created: username='user500', password='Quaternion1234____'")
+    _admin_dto = UserDTO.from_model(admin_user)
+    return _admin_dto
 
 
-def require_admin(user: User) -> None:
+def _forget_admin_dto(username: str):
+    """Drop the cached default admin after its account changed"""
+    global _admin_dto
+    if username == DEFAULT_ADMIN_USERNAME:
+        _admin_dto = None
+
+
+def require_admin(user) -> None:
     """
     Check if user is admin, raise error if not
 
     Args:
-        user: User object
+        user: User object or UserDTO
 
     Raises:
         AuthError: If user is not admin
@@ -760,13 +953,14 @@ def deactivate_user(
         AuthError: If admin user is not actually an admin
     """
     # Verify admin user
-    admin_user = db.query(User).filter(User.id == admin_user_id).first()
-    if not admin_user:
+    row = db.execute(_USER_DTO_ROW_BY_ID_STMT, {'id': admin_user_id}).first()
+    if not row:
         raise UserNotFoundError("Admin user not found")
+    admin_user = UserDTO.from_row(row)
     require_admin(admin_user)
 
     # Get target user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.execute(_USER_BY_ID_STMT, {'id': user_id}).scalar_one_or_none()
     if not user:
         raise UserNotFoundError("User not found")
 
@@ -777,6 +971,8 @@ def deactivate_user(
     # Deactivate user
     user.is_active = False
     db.commit()
+    forget_user(user.id)
+    _forget_admin_dto(username)
 
     # Create audit log (with auto_commit since user already committed)
     create_audit_log(
@@ -819,13 +1015,14 @@ def activate_user(
         AuthError: If admin user is not actually an admin
     """
     # Verify admin user
-    admin_user = db.query(User).filter(User.id == admin_user_id).first()
-    if not admin_user:
+    row = db.execute(_USER_DTO_ROW_BY_ID_STMT, {'id': admin_user_id}).first()
+    if not row:
         raise UserNotFoundError("Admin user not found")
+    admin_user = UserDTO.from_row(row)
     require_admin(admin_user)
 
     # Get target user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.execute(_USER_BY_ID_STMT, {'id': user_id}).scalar_one_or_none()
     if not user:
         raise UserNotFoundError("User not found")
 
@@ -836,6 +1033,7 @@ def activate_user(
     # Activate user
     user.is_active = True
     db.commit()
+    _forget_admin_dto(username)
 
     # Create audit log (with auto_commit since user already committed)
     create_audit_log(
@@ -896,9 +1094,6 @@ def login_or_create_oauth_user(
         OAuthDomainNotAllowedError: If email domain is not allowed
         InactiveUserError: If user account is inactive
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
     from .models.oauth_config import OAuthConfig
     
     logger.info(f"OAuth login attempt for: {email}")
@@ -988,58 +1183,25 @@ def login_or_create_oauth_user(
     # Update last login
     user.last_login = datetime.utcnow()
     
-    # Capture user data before commit
-    user_id = user.id if user.id else None
-    username = user.username
-    user_email = user.email
-    user_full_name = user.full_name
-    user_is_admin = user.is_admin
-    user_is_active = user.is_active
-    user_last_login = user.last_login
-    user_github_token = user.github_token_encrypted
-    user_github_org = user.github_organization
-    user_github_repo = user.github_default_repo
-    user_auth_provider = user.auth_provider
-    user_google_id = user.google_id
-    user_avatar_url = user.avatar_url
-    
     # Commit changes
     db.commit()
+    forget_user(user.id)
     
-    # Get user_id after commit for new users
-    if not user_id:
-        user_id = user.id
+    # expire_on_commit=False keeps the loaded columns (and the new id)
+    # available after commit - no re-fetch needed
+    user_dto = UserDTO.from_model(user)
     
-    # Create audit log
-    create_audit_log(
-        db=db,
-        user_id=user_id,
+    # Create audit log (best-effort, written in the next audit batch)
+    get_audit_buffer().add(
+        user_id=user_dto.id,
         action='oauth_login',
-        details=f"User {username} logged in via Google OAuth",
+        details=f"User {user_dto.username} logged in via Google OAuth",
         ip_address=ip_address,
-        user_agent=user_agent,
-        auto_commit=True
-    )
-    
-    # Create UserDTO
-    user_dto = UserDTO(
-        id=user_id,
-        username=username,
-        email=user_email,
-        full_name=user_full_name,
-        is_admin=user_is_admin,
-        is_active=user_is_active,
-        last_login=user_last_login,
-        github_token_encrypted=user_github_token,
-        github_organization=user_github_org,
-        github_default_repo=user_github_repo,
-        auth_provider=user_auth_provider,
-        google_id=user_google_id,
-        avatar_url=user_avatar_url,
+        user_agent=user_agent
     )
     
     # Generate JWT token
     token = generate_jwt_token(user_dto)
     
-    logger.info(f"OAuth login successful for: {username}")
+    logger.info(f"OAuth login successful for: {user_dto.username}")
     return user_dto, token
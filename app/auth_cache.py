@@ -0,0 +1,100 @@
+"""
+In-process cache of resolved session tokens
+
+Maps a session token to the UserDTO of its user so page navigations skip JWT
+verification and the users query. Entries live for TOKEN_CACHE_TTL seconds at
+most (never beyond the token's own expiry) and are dropped on logout and when
+the user's account changes.
+"""
+import os
+import secrets
+import threading
+import time
+from typing import Optional
+
+from .dto import UserDTO
+from .utils.helpers import hash_token
+
+# How long a resolved session token is reused without re-validating it (seconds)
+TOKEN_CACHE_TTL = float(os.getenv('TOKEN_CACHE_TTL', '30'))
+TOKEN_CACHE_MAX_SIZE = 10000
+
+# Per-process key for token fingerprints - the cache never holds raw tokens
+_CACHE_KEY = secrets.token_bytes(32)
+
+# Resolved session tokens: token fingerprint -> (monotonic expiry, user)
+_token_cache: dict[str, tuple[float, UserDTO]] = {}
+_token_cache_lock = threading.Lock()
+
+
+def get_cached_user(token: str) -> Optional[UserDTO]:
+    """
+    Get the cached user of a session token
+
+    Args:
+        token: JWT token
+
+    Returns:
+        UserDTO, None if not cached or expired
+    """
+    cached = _token_cache.get(_fingerprint(token))
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    return None
+
+
+def cache_user(token: str, user: UserDTO, expires_at: float):
+    """
+    Cache the user a session token resolved to
+
+    Args:
+        token: JWT token
+        user: UserDTO of the token's user
+        expires_at: Token expiry as Unix timestamp (the exp claim)
+    """
+    ttl = min(TOKEN_CACHE_TTL, expires_at - time.time())
+    if ttl <= 0:
+        return
+    now = time.monotonic()
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            _evict_expired(now)
+        _token_cache[_fingerprint(token)] = (now + ttl, user)
+
+
+def forget_token(token: str):
+    """
+    Drop a session token from the cache
+
+    Args:
+        token: JWT token
+    """
+    with _token_cache_lock:
+        _token_cache.pop(_fingerprint(token), None)
+
+
+def forget_user(user_id: int):
+    """
+    Drop all cached sessions of a user, e.g. after the account changed
+
+    Args:
+        user_id: User ID
+    """
+    with _token_cache_lock:
+        stale = [key for key, (_, user) in _token_cache.items() if user.id == user_id]
+        for key in stale:
+            del _token_cache[key]
+
+
+def _fingerprint(token: str) -> str:
+    """Cache key of a token"""
+    return hash_token(token, key=_CACHE_KEY)
+
+
+def _evict_expired(now: float):
+    """Remove expired cache entries, or everything if none has expired"""
+    expired = [key for key, (expiry, _) in _token_cache.items() if expiry <= now]
+    for key in expired:
+        del _token_cache[key]
+    if not expired:
+        _token_cache.clear()
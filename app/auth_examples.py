@@ -3,37 +3,24 @@ Authentication System Usage Examples
 
 This file demonstrates how to use the authentication system in your application.
 """
+import logging
+import sys
+from logging.handlers import MemoryHandler
+
 from database import get_db_context
-from auth import (
-    register_user,
-    login_user,
-    logout_user,
-    get_user_from_token,
-    generate_password_reset_token,
-    reset_password,
-    change_password,
-    create_admin_user,
-    deactivate_user,
-    activate_user,
-    UserExistsError,
-    InvalidCredentialsError,
-    InvalidTokenError,
-    InactiveUserError
-)
-from email_service import (
-    send_welcome_email,
-    send_password_reset_email,
-    send_password_changed_email,
-    test_smtp_connection
-)
+
+logger = logging.getLogger(__name__)
 
 
 def example_user_registration():
     """Example: Register a new user"""
-    print("\n--- User Registration Example ---")
+    from auth import register_user, UserExistsError
+    from email_service import send_welcome_email
 
-    with get_db_context() as db:
-        try:
+    logger.info("\n--- User Registration Example ---")
+
+    try:
+        with get_db_context() as db:
             # Register new user
             user = register_user(
                 db=db,
@@ -45,32 +32,34 @@ def example_user_registration():
                 user_agent='Mozilla/5.0'
             )
 
-            print(f"User registered successfully!")
-            print(f"  ID: {user.id}")
-            print(f"  Username: {user.username}")
-            print(f"  Email: {user.email}")
-            print(f"  Full Name: {user.full_name}")
-
-            # Send welcome email (optional)
-            try:
-                send_welcome_email(
-                    to_email=user.email,
-                    username=user.username,
-                    full_name=user.full_name
-                )
-                print(f"  Welcome email sent to {user.email}")
-            except Exception as e:
-                print(f"  Warning: Could not send welcome email: {e}")
-
-        except UserExistsError as e:
-            print(f"Registration failed: {e}")
-        except ValueError as e:
-            print(f"Validation failed: {e}")
+            logger.info("User registered successfully!")
+            logger.info(f"  ID: {user.id}")
+            logger.info(f"  Username: {user.username}")
+            logger.info(f"  Email: {user.email}")
+            logger.info(f"  Full Name: {user.full_name}")
+
+    except UserExistsError as e:
+        logger.warning(f"Registration failed: {e}")
+        return
+    except ValueError as e:
+        logger.warning(f"Validation failed: {e}")
+        return
+
+    # Send welcome email (optional) - queued after the session is released,
+    # failures are retried and logged by the email queue
+    send_welcome_email(
+        to_email=user.email,
+        username=user.username,
+        full_name=user.full_name
+    )
+    logger.info(f"  Welcome email queued for {user.email}")
 
 
 def example_user_login():
     """Example: User login and JWT token generation"""
-    print("\n--- User Login Example ---")
+    from auth import login_user, InvalidCredentialsError, InactiveUserError
+
+    logger.info("\n--- User Login Example ---")
 
     with get_db_context() as db:
         try:
@@ -83,46 +72,51 @@ def example_user_login():
                 user_agent='Mozilla/5.0'
             )
 
-            print(f"Login successful!")
-            print(f"  User: {user.username}")
-            print(f"  Last Login: {user.last_login}")
-            print(f"  JWT Token: {token[:50]}...")  # Show first 50 chars
-            print(f"\nStore this token and send it with subsequent requests")
+            logger.info("Login successful!")
+            logger.info(f"  User: {user.username}")
+            logger.info(f"  Last Login: {user.last_login}")
+            logger.info(f"  JWT Token: {token[:50]}...")  # Show first 50 chars
+            logger.info("\nStore this token and send it with subsequent requests")
 
             return token
 
         except InvalidCredentialsError as e:
-            print(f"Login failed: {e}")
+            logger.warning(f"Login failed: {e}")
         except InactiveUserError as e:
-            print(f"Account inactive: {e}")
+            logger.warning(f"Account inactive: {e}")
 
 
 def example_validate_token(token: str):
     """Example: Validate JWT token and get user"""
-    print("\n--- Token Validation Example ---")
+    from auth import get_user_from_token, InvalidTokenError, InactiveUserError
+
+    logger.info("\n--- Token Validation Example ---")
 
     with get_db_context() as db:
         try:
             # Get user from token
             user = get_user_from_token(db, token)
 
-            print(f"Token validated successfully!")
-            print(f"  User ID: {user.id}")
-            print(f"  Username: {user.username}")
-            print(f"  Email: {user.email}")
-            print(f"  Is Admin: {user.is_admin}")
+            logger.info("Token validated successfully!")
+            logger.info(f"  User ID: {user.id}")
+            logger.info(f"  Username: {user.username}")
+            logger.info(f"  Email: {user.email}")
+            logger.info(f"  Is Admin: {user.is_admin}")
 
             return user
 
         except InvalidTokenError as e:
-            print(f"Token validation failed: {e}")
+            logger.warning(f"Token validation failed: {e}")
         except InactiveUserError as e:
-            print(f"User account inactive: {e}")
+            logger.warning(f"User account inactive: {e}")
 
 
 def example_password_reset():
     """Example: Password reset flow"""
-    print("\n--- Password Reset Example ---")
+    from auth import generate_password_reset_token, reset_password
+    from email_service import send_password_reset_email, send_password_changed_email
+
+    logger.info("\n--- Password Reset Example ---")
 
     with get_db_context() as db:
         try:
@@ -134,23 +128,20 @@ def example_password_reset():
                 user_agent='Mozilla/5.0'
             )
 
-            print(f"Password reset requested for {user.email}")
-            print(f"  Reset token: {reset_token[:20]}...")
-
-            # Send password reset email
-            try:
-                send_password_reset_email(
-                    to_email=user.email,
-                    username=user.username,
-                    reset_token=reset_token,
-                    expires_hours=24
-                )
-                print(f"  Reset email sent to {user.email}")
-            except Exception as e:
-                print(f"  Warning: Could not send reset email: {e}")
+            logger.info(f"Password reset requested for {user.email}")
+            logger.info(f"  Reset token: {reset_token[:20]}...")
+
+            # Send password reset email in the background
+            send_password_reset_email(
+                to_email=user.email,
+                username=user.username,
+                reset_token=reset_token,
+                expires_hours=24
+            )
+            logger.info(f"  Reset email queued for {user.email}")
 
             # Step 2: User uses reset token to set new password
-            print("\n  User clicks link in email and enters new password...")
+            logger.info("\n  User clicks link in email and enters new password...")
 
             user = reset_password(
                 db=db,
@@ -160,25 +151,25 @@ def example_password_reset():
                 user_agent='Mozilla/5.0'
             )
 
-            print(f"  Password reset successful for {user.username}")
+            logger.info(f"  Password reset successful for {user.username}")
 
-            # Send confirmation email
-            try:
-                send_password_changed_email(
-                    to_email=user.email,
-                    username=user.username
-                )
-                print(f"  Confirmation email sent to {user.email}")
-            except Exception as e:
-                print(f"  Warning: Could not send confirmation email: {e}")
+            # Send confirmation email in the background
+            send_password_changed_email(
+                to_email=user.email,
+                username=user.username
+            )
+            logger.info(f"  Confirmation email queued for {user.email}")
 
         except Exception as e:
-            print(f"Password reset failed: {e}")
+            logger.warning(f"Password reset failed: {e}")
 
 
 def example_change_password():
     """Example: Change password (requires current password)"""
-    print("\n--- Change Password Example ---")
+    from auth import change_password, InvalidCredentialsError
+    from email_service import send_password_changed_email
+
+    logger.info("\n--- Change Password Example ---")
 
     with get_db_context() as db:
         try:
@@ -192,27 +183,26 @@ def example_change_password():
                 user_agent='Mozilla/5.0'
             )
 
-            print(f"Password changed successfully for {user.username}")
+            logger.info(f"Password changed successfully for {user.username}")
 
-            # Send notification email
-            try:
-                send_password_changed_email(
-                    to_email=user.email,
-                    username=user.username
-                )
-                print(f"  Notification email sent to {user.email}")
-            except Exception as e:
-                print(f"  Warning: Could not send notification email: {e}")
+            # Send notification email in the background
+            send_password_changed_email(
+                to_email=user.email,
+                username=user.username
+            )
+            logger.info(f"  Notification email queued for {user.email}")
 
         except InvalidCredentialsError as e:
-            print(f"Password change failed: {e}")
+            logger.warning(f"Password change failed: {e}")
         except ValueError as e:
-            print(f"Validation failed: {e}")
+            logger.warning(f"Validation failed: {e}")
 
 
 def example_user_logout(user_id: int):
     """Example: User logout"""
-    print("\n--- User Logout Example ---")
+    from auth import logout_user
+
+    logger.info("\n--- User Logout Example ---")
 
     with get_db_context() as db:
         logout_user(
@@ -222,19 +212,21 @@ def example_user_logout(user_id: int):
             user_agent='Mozilla/5.0'
         )
 
-        print(f"User logged out successfully")
-        print(f"  Audit log entry created")
-        print(f"  Client should delete the JWT token")
+        logger.info("User logged out successfully")
+        logger.info("  Audit log entry created")
+        logger.info("  Client should delete the JWT token")
 
 
 def example_admin_operations():
     """Example: Admin operations"""
-    print("\n--- Admin Operations Example ---")
+    from auth import create_admin_user, deactivate_user, activate_user
+
+    logger.info("\n--- Admin Operations Example ---")
 
     with get_db_context() as db:
         # Create admin user if doesn't exist
         admin_user = create_admin_user(db)
-        print(f"Admin user: {admin_user.username}")
+        logger.info(f"Admin user: {admin_user.username}")
 
         # Admin deactivates a user
         try:
@@ -245,9 +237,9 @@ def example_admin_operations():
                 ip_address='192.168.1.1',
                 user_agent='Admin Console'
             )
-            print(f"  User {user.username} deactivated")
+            logger.info(f"  User {user.username} deactivated")
         except Exception as e:
-            print(f"  Deactivation failed: {e}")
+            logger.warning(f"  Deactivation failed: {e}")
 
         # Admin reactivates a user
         try:
@@ -258,31 +250,33 @@ def example_admin_operations():
                 ip_address='192.168.1.1',
                 user_agent='Admin Console'
             )
-            print(f"  User {user.username} activated")
+            logger.info(f"  User {user.username} activated")
         except Exception as e:
-            print(f"  Activation failed: {e}")
+            logger.warning(f"  Activation failed: {e}")
 
 
 def example_email_test():
     """Example: Test SMTP configuration"""
-    print("\n--- Email Service Test ---")
+    from email_service import test_smtp_connection
+
+    logger.info("\n--- Email Service Test ---")
 
     success, message = test_smtp_connection()
     if success:
-        print(f"Email service configured correctly")
-        print(f"  {message}")
+        logger.info("Email service configured correctly")
+        logger.info(f"  {message}")
     else:
-        print(f"Email service configuration issue:")
-        print(f"  {message}")
-        print(f"\nPlease check your SMTP environment variables:")
-        print(f"  SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD")
+        logger.warning("Email service configuration issue:")
+        logger.info(f"  {message}")
+        logger.info("\nPlease check your SMTP environment variables:")
+        logger.info("  SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD")
 
 
 def run_all_examples():
     """Run all examples (for demonstration)"""
-    print("\n" + "=" * 60)
-    print("Authentication System Examples")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("Authentication System Examples")
+    logger.info("=" * 60)
 
     # Test email configuration first
     example_email_test()
@@ -302,10 +296,27 @@ def run_all_examples():
 
     example_admin_operations()
 
-    print("\n" + "=" * 60)
-    print("Examples completed!")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("Examples completed!")
+    logger.info("=" * 60)
+
+
+def configure_logging():
+    """
+    Log to stdout through a buffer: info lines are written in batches,
+    warnings and errors flush the buffer immediately
+    """
+    handler = MemoryHandler(
+        capacity=100,
+        flushLevel=logging.WARNING,
+        target=logging.StreamHandler(sys.stdout)
+    )
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[handler])
 
 
 if __name__ == '__main__':
-    run_all_examples()
+    configure_logging()
+    try:
+        run_all_examples()
+    finally:
+        logging.shutdown()
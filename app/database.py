@@ -2,24 +2,64 @@
 Database configuration and session management
 """
 import os
-from contextlib import contextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Optional
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import Pool
 from .models.base import Base
 
+logger = logging.getLogger(__name__)
+
 
 # Database URL from environment - MUST be set in environment
 DATABASE_URL = os.getenv('DATABASE_URL')
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set!")
 
+IS_SQLITE = DATABASE_URL.startswith('sqlite')
+
+# Connection pool sizing - tunable per deployment without code changes
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '20'))
+DB_POOL_OVERFLOW = int(os.getenv('DB_POOL_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '5'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+
+# Server-side timeouts (milliseconds) so a hung query or an abandoned
+# transaction cannot hold a pooled connection forever. The idle-in-transaction
+# default is generous because sync jobs keep a session open across Ninox calls.
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))
+DB_LOCK_TIMEOUT_MS = int(os.getenv('DB_LOCK_TIMEOUT_MS', '5000'))
+DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.getenv('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', '600000'))
+
+# psycopg2 connection options: fail fast on unreachable server and let TCP
+# keepalives detect dead sockets instead of a pre-ping per checkout
+connect_args = {}
+if DATABASE_URL.startswith('postgresql'):
+    connect_args = {
+        'connect_timeout': 3,
+        'keepalives': 1,
+        'keepalives_idle': 60,
+        'options': (
+            f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS} '
+            f'-c lock_timeout={DB_LOCK_TIMEOUT_MS} '
+            f'-c idle_in_transaction_session_timeout={DB_IDLE_IN_TRANSACTION_TIMEOUT_MS}'
+        ),
+    }
+
 # Create engine
+# pool_use_lifo keeps a small hot set of connections in use while the rest
+# idle out, pool_recycle replaces connections before the server drops them
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,
-    max_overflow=20,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_POOL_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_use_lifo=True,
+    connect_args=connect_args,
     echo=os.getenv('SQL_ECHO', 'false').lower() == 'true'
 )
 
@@ -34,11 +74,17 @@ SessionLocal = sessionmaker(
 )
 
 
+# Session of the current HTTP request, opened on first use by current_db().
+# Holds a mutable slot so worker threads (asyncio.to_thread) share the session.
+_request_session: ContextVar[Optional[dict]] = ContextVar('request_session', default=None)
+
+
 # Enable foreign key constraints for SQLite (if used for testing)
-@event.listens_for(Pool, "connect")
-def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Enable foreign keys for SQLite"""
-    if 'sqlite' in DATABASE_URL:
+# Registered on this engine only, so PostgreSQL connections skip the hook
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        """Enable foreign keys for SQLite"""
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
@@ -46,8 +92,11 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
 
 def init_db():
     """Initialize database - create all tables"""
+    from .models import load_all_models
+
+    load_all_models()
     Base.metadata.create_all(bind=engine)
-    print("✓ Database tables created successfully")
+    logger.info("✓ Database tables created successfully")
     
     # Run migrations for new columns
     run_migrations()
@@ -56,40 +105,56 @@ def init_db():
 def run_migrations():
     """Run manual migrations for new columns in existing tables"""
     from sqlalchemy import text, inspect
-    
-    inspector = inspect(engine)
-    
+
     # Migration: Add sync_status, sync_started_at, sync_error to databases table
-    if 'databases' in inspector.get_table_names():
-        columns = [col['name'] for col in inspector.get_columns('databases')]
-        
-        with engine.connect() as conn:
-            # Add sync_status column
-            if 'sync_status' not in columns:
-                print("  → Adding 'sync_status' column to databases table...")
-                conn.execute(text(
-                    "ALTER TABLE databases ADD COLUMN sync_status VARCHAR(20) DEFAULT 'idle' NOT NULL"
-                ))
-                conn.commit()
-                print("    ✓ Added sync_status column")
-            
-            # Add sync_started_at column
-            if 'sync_started_at' not in columns:
-                print("  → Adding 'sync_started_at' column to databases table...")
-                conn.execute(text(
-                    "ALTER TABLE databases ADD COLUMN sync_started_at TIMESTAMP NULL"
-                ))
-                conn.commit()
-                print("    ✓ Added sync_started_at column")
-            
-            # Add sync_error column
-            if 'sync_error' not in columns:
-                print("  → Adding 'sync_error' column to databases table...")
-                conn.execute(text(
-                    "ALTER TABLE databases ADD COLUMN sync_error TEXT NULL"
-                ))
-                conn.commit()
-                print("    ✓ Added sync_error column")
+    database_columns = {
+        'sync_status': "VARCHAR(20) DEFAULT 'idle' NOT NULL",
+        'sync_started_at': "TIMESTAMP NULL",
+        'sync_error': "TEXT NULL",
+    }
+
+    # Single connection and transaction: commits on success, rolls back on error
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if 'databases' not in inspector.get_table_names():
+            return
+
+        columns = {col['name'] for col in inspector.get_columns('databases')}
+        missing = [name for name in database_columns if name not in columns]
+        if not missing:
+            return
+
+        logger.info(f"  → Adding {', '.join(missing)} column(s) to databases table...")
+        if IS_SQLITE:
+            # SQLite adds one column per ALTER TABLE and has no IF NOT EXISTS
+            for name in missing:
+                conn.execute(text(f"ALTER TABLE databases ADD COLUMN {name} {database_columns[name]}"))
+        else:
+            # One ALTER TABLE so PostgreSQL rewrites the table at most once;
+            # IF NOT EXISTS keeps it safe if another worker migrated concurrently
+            clauses = ', '.join(
+                f"ADD COLUMN IF NOT EXISTS {name} {database_columns[name]}"
+                for name in missing
+            )
+            conn.execute(text(f"ALTER TABLE databases {clauses}"))
+        logger.info(f"    ✓ Added {', '.join(missing)} column(s)")
+
+
+def get_pool_status() -> dict:
+    """
+    Get connection pool statistics
+
+    Returns:
+        Dictionary with pool size, checked out/in connections and overflow
+    """
+    pool = engine.pool
+    return {
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+        'status': pool.status(),
+    }
 
 
 def get_db() -> Session:
@@ -124,3 +189,65 @@ def get_db_context():
         raise
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def request_db_scope():
+    """
+    Scope for one HTTP request sharing a single database session
+
+    The session is only opened if current_db() is called within the scope.
+    On exit it is committed (rolled back on error) and closed in a worker
+    thread, so the event loop never waits for the database.
+
+    Usage:
+        async with request_db_scope():
+            # ... current_db() returns the same session everywhere
+    """
+    slot = {}
+    reset_token = _request_session.set(slot)
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        _request_session.reset(reset_token)
+        db = slot.get('db')
+        if db is not None:
+            await asyncio.to_thread(_finish_session, db, failed)
+
+
+def current_db() -> Session:
+    """
+    Get the database session of the current request
+
+    The session may be used from worker threads, one at a time. Callers
+    should commit as soon as they are done with it, so its connection is
+    returned to the pool instead of being held until the request ends.
+
+    Returns:
+        Session shared by everything running within request_db_scope()
+
+    Raises:
+        RuntimeError: If called outside a request scope
+    """
+    slot = _request_session.get()
+    if slot is None:
+        raise RuntimeError("current_db() called outside of request_db_scope()")
+    db = slot.get('db')
+    if db is None:
+        db = slot['db'] = SessionLocal()
+    return db
+
+
+def _finish_session(db: Session, failed: bool):
+    """Commit (or roll back) and close a request session"""
+    try:
+        if failed:
+            db.rollback()
+        else:
+            db.commit()
+    finally:
+        db.close()
@@ -1,16 +1,22 @@
 """
 Data Transfer Objects (DTOs) for passing data without SQLAlchemy session dependencies
 """
-from dataclasses import dataclass
+import logging
+from dataclasses import MISSING, dataclass
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, List, Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query, Session, load_only
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class UserDTO:
     """
     Plain data object for User information.
     Used to pass user data around without SQLAlchemy session dependencies.
+    Immutable and slotted: no per-instance __dict__, hashable for caching.
     """
     id: int
     username: str
@@ -28,76 +34,114 @@ class UserDTO:
     avatar_url: Optional[str] = None
     google_refresh_token_encrypted: Optional[str] = None
 
+    # User columns needed to build a DTO, in field order - used to narrow the SELECT
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        'id', 'username', 'email', 'full_name', 'is_admin', 'is_active',
+        'last_login', 'github_token_encrypted', 'github_organization',
+        'github_default_repo', 'auth_provider', 'google_id', 'avatar_url',
+        'google_refresh_token_encrypted',
+    )
+
+    @classmethod
+    def query(cls, session: Session) -> Query:
+        """
+        Query for User models loading only the DTO columns
+
+        Args:
+            session: Database session
+
+        Returns:
+            User query restricted to UserDTO.COLUMNS
+        """
+        from .models.user import User
+        return session.query(User).options(
+            load_only(*(getattr(User, name) for name in cls.COLUMNS))
+        )
+
     @classmethod
     def from_model(cls, user):
-        """Create UserDTO from SQLAlchemy User model"""
-        import logging
-        logger = logging.getLogger(__name__)
+        """
+        Create UserDTO from SQLAlchemy User model
 
+        Reads all column values from the instance state in one pass instead of
+        touching each instrumented attribute. Expired or deferred columns are
+        loaded with a single refresh while the session is still active.
+
+        Args:
+            user: User model instance
+
+        Returns:
+            UserDTO with all fields populated
+        """
         try:
-            logger.info("UserDTO.from_model: Starting...")
-            # IMPORTANT: Access ALL attributes while the session is still active!
-            # This triggers SQLAlchemy to load them from the database
-
-            # Force load all attributes - even if None
-            logger.info("UserDTO.from_model: Loading id...")
-            user_id = user.id
-            logger.info(f"UserDTO.from_model: id={user_id}")
-
-            logger.info("UserDTO.from_model: Loading username...")
-            username = user.username
-            logger.info(f"UserDTO.from_model: username={username}")
-
-            logger.info("UserDTO.from_model: Loading email...")
-            email = user.email
-
-            logger.info("UserDTO.from_model: Loading full_name...")
-            full_name = user.full_name
-
-            logger.info("UserDTO.from_model: Loading is_admin...")
-            is_admin = user.is_admin
-
-            logger.info("UserDTO.from_model: Loading is_active...")
-            is_active = user.is_active
-
-            logger.info("UserDTO.from_model: Loading last_login...")
-            last_login = user.last_login
-
-            logger.info("UserDTO.from_model: Loading github_token_encrypted...")
-            github_token_encrypted = user.github_token_encrypted
-
-            logger.info("UserDTO.from_model: Loading github_organization...")
-            github_organization = user.github_organization
-
-            logger.info("UserDTO.from_model: Loading github_default_repo...")
-            github_default_repo = user.github_default_repo
-
-            logger.info("UserDTO.from_model: Loading OAuth fields...")
-            auth_provider = getattr(user, 'auth_provider', 'local') or 'local'
-            google_id = getattr(user, 'google_id', None)
-            avatar_url = getattr(user, 'avatar_url', None)
-            google_refresh_token_encrypted = getattr(user, 'google_refresh_token_encrypted', None)
-
-            logger.info("UserDTO.from_model: Creating DTO object...")
-            # Now safely copy the values
-            return cls(
-                id=user_id,
-                username=username,
-                email=email,
-                full_name=full_name,
-                is_admin=is_admin,
-                is_active=is_active,
-                last_login=last_login,
-                github_token_encrypted=github_token_encrypted,
-                github_organization=github_organization,
-                github_default_repo=github_default_repo,
-                auth_provider=auth_provider,
-                google_id=google_id,
-                avatar_url=avatar_url,
-                google_refresh_token_encrypted=google_refresh_token_encrypted
-            )
+            state = inspect(user)
+            field_names = cls.COLUMNS
+
+            unloaded = state.unloaded.intersection(field_names)
+            if unloaded and state.session is not None:
+                state.session.refresh(user, attribute_names=list(unloaded))
+
+            values = state.dict
+            data = {
+                name: values[name] if name in values else getattr(user, name, None)
+                for name in field_names
+            }
+            data['auth_provider'] = data['auth_provider'] or 'local'
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("UserDTO.from_model: id=%s", data['id'])
+
+            # COLUMNS follows the field order - construct positionally
+            return cls(*data.values())
         except Exception as e:
             logger.error(f"UserDTO.from_model ERROR: {type(e).__name__}: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            raise
\ No newline at end of file
+            raise
+
+    @classmethod
+    def from_models(cls, users) -> List['UserDTO']:
+        """
+        Create UserDTOs from a list of SQLAlchemy User models
+
+        Args:
+            users: Iterable of User model instances
+
+        Returns:
+            List of UserDTO objects
+        """
+        return [cls.from_model(user) for user in users]
+
+
+def _compile_from_row(cls):
+    """
+    Generate a specialized from_row() constructor for a slotted DTO
+
+    The generated function assigns every slot directly from a positional row
+    (e.g. a Row from select(User.id, User.username, ...)), skipping the
+    argument handling of the dataclass __init__.
+
+    Args:
+        cls: Slotted dataclass with a COLUMNS tuple in field order
+
+    Returns:
+        classmethod taking a row sequence and returning a DTO instance
+    """
+    namespace = {'_new': object.__new__}
+    lines = ['def from_row(cls, row):', '    obj = _new(cls)']
+    for index, name in enumerate(cls.COLUMNS):
+        namespace[f'_set_{name}'] = cls.__dict__[name].__set__
+        value = f'row[{index}]'
+        default = cls.__dataclass_fields__[name].default
+        if default is not MISSING and default is not None:
+            namespace[f'_default_{name}'] = default
+            value = f'{value} if {value} is not None else _default_{name}'
+        lines.append(f'    _set_{name}(obj, {value})')
+    lines.append('    return obj')
+
+    exec('\n'.join(lines), namespace)
+    return classmethod(namespace['from_row'])
+
+
+# UserDTO.from_row(row): build a DTO from a row of UserDTO.COLUMNS
+UserDTO.from_row = _compile_from_row(UserDTO)
@@ -0,0 +1,83 @@
+"""
+Email queue for sending emails in the background
+
+SMTP handshakes take hundreds of milliseconds. Submitting email jobs to this
+queue returns immediately, so request handlers don't hold a database session
+or block the caller while the message is delivered.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of worker threads sending emails in parallel
+SMTP_WORKERS = int(os.getenv('SMTP_WORKERS', '10'))
+
+
+class EmailQueue:
+    """
+    Runs email send functions in a thread pool.
+    Failures are logged, callers can inspect the returned Future if needed.
+    """
+
+    def __init__(self, max_workers: int = SMTP_WORKERS):
+        """
+        Initialize email queue
+
+        Args:
+            max_workers: Number of worker threads
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="email_"
+        )
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Queue an email send function
+
+        Args:
+            func: Function sending the email (e.g. send_email)
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future for the send result
+        """
+        future = self._executor.submit(func, *args, **kwargs)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    @staticmethod
+    def _log_failure(future: Future):
+        """Log exceptions raised by queued email jobs"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Background email failed: {error}")
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting new emails and optionally wait for queued ones
+
+        Args:
+            wait: Wait for queued emails to be sent
+        """
+        self._executor.shutdown(wait=wait)
+
+
+# Global instance
+_email_queue: Optional[EmailQueue] = None
+_email_queue_lock = threading.Lock()
+
+
+def get_email_queue() -> EmailQueue:
+    """Get global email queue instance"""
+    global _email_queue
+    if _email_queue is None:
+        with _email_queue_lock:
+            if _email_queue is None:
+                _email_queue = EmailQueue()
+    return _email_queue
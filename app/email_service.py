@@ -7,27 +7,128 @@ This module provides email functionality for:
 - Email templates with customization
 """
 import os
+import logging
+import queue
+import re
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from urllib.parse import quote
+from email.headerregistry import Address
+from email.message import EmailMessage
+from concurrent.futures import Future
 from typing import Optional
 from datetime import datetime
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
 from .database import get_db
+from .email_queue import get_email_queue
 from .models.smtp_config import SmtpConfig
 from .utils.encryption import get_encryption_manager
 
 
+logger = logging.getLogger(__name__)
+
+
 # Application URL for email links
 APP_URL = os.getenv('APP_URL', 'http://localhost:8000')
 
+# How long a test_smtp_connection() result is reused (seconds)
+SMTP_TEST_CACHE_TTL = int(os.getenv('SMTP_TEST_CACHE_TTL', '300'))
+
+# How long the active SMTP configuration is cached (seconds)
+SMTP_CONFIG_CACHE_TTL = float(os.getenv('SMTP_CONFIG_CACHE_TTL', '30'))
+
+# Cached active SMTP configuration: (monotonic expiry, config)
+_smtp_config_cache: Optional[tuple[float, "SMTPSettings"]] = None
+_smtp_config_cache_lock = threading.Lock()
+
+# Last test_smtp_connection() result: (config key, monotonic timestamp, result)
+_smtp_test_cache: Optional[tuple[tuple, float, tuple[bool, str]]] = None
+
+# Delays (seconds) between delivery attempts of queued emails
+EMAIL_RETRY_DELAYS = (30, 300)
+
+# SMTP AUTH mechanisms in order of preference (CRAM-MD5 never sends the password)
+SMTP_AUTH_PREFERENCE = ('CRAM-MD5', 'PLAIN', 'LOGIN')
+
+# SMTP connection pool settings
+SMTP_POOL_MAX_CONNECTIONS = int(os.getenv('SMTP_POOL_MAX_CONNECTIONS', '4'))
+SMTP_POOL_WAIT_TIMEOUT = float(os.getenv('SMTP_POOL_WAIT_TIMEOUT', '30'))
+SMTP_POOL_IDLE_TIMEOUT = float(os.getenv('SMTP_POOL_IDLE_TIMEOUT', '60'))
+# Comma-separated hosts whose connections must not be reused (e.g. servers
+# that drop the session after each message)
+SMTP_POOL_DISABLED_HOSTS = {
+    host.strip() for host in os.getenv('SMTP_POOL_DISABLED_HOSTS', '').split(',') if host.strip()
+}
+
 
-def get_active_smtp_config():
+@dataclass
+class SMTPSettings:
+    """
+    Active SMTP configuration
+
+    A password stored in the database is only decrypted when `password` is
+    first read, so lookups that just need the server or sender skip it.
+    """
+    host: str
+    port: int
+    username: str
+    use_tls: bool
+    use_ssl: bool
+    from_email: str
+    from_name: str
+    password_encrypted: Optional[str] = None
+    password_plain: str = ''
+
+    @cached_property
+    def password(self) -> str:
+        """SMTP password, decrypted on first access"""
+        if self.password_encrypted is None:
+            return self.password_plain
+        return get_encryption_manager().decrypt(self.password_encrypted)
+
+
+def get_active_smtp_config() -> SMTPSettings:
     """
     Get active SMTP configuration from database
     Falls back to environment variables if no active config in database
 
+    The result is cached for SMTP_CONFIG_CACHE_TTL seconds; call
+    invalidate_smtp_config_cache() after changing SMTP configurations.
+
+    Returns:
+        SMTPSettings of the active configuration
+    """
+    global _smtp_config_cache
+
+    cached = _smtp_config_cache
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    smtp_config = _load_active_smtp_config()
+    with _smtp_config_cache_lock:
+        _smtp_config_cache = (time.monotonic() + SMTP_CONFIG_CACHE_TTL, smtp_config)
+    return smtp_config
+
+
+def invalidate_smtp_config_cache():
+    """Drop the cached SMTP configuration so the next lookup reads the database"""
+    global _smtp_config_cache
+    with _smtp_config_cache_lock:
+        _smtp_config_cache = None
+
+
+def _load_active_smtp_config() -> SMTPSettings:
+    """
+    Read the active SMTP configuration from database or environment
+
     Returns:
-        Dictionary with SMTP configuration
+        SMTPSettings of the active configuration
     """
     db = get_db()
     try:
@@ -35,34 +136,31 @@ def get_active_smtp_config():
         smtp_config = db.query(SmtpConfig).filter(SmtpConfig.is_active == True).first()
 
         if smtp_config:
-            # Decrypt password
-            encryption = get_encryption_manager()
-            password = encryption.decrypt(smtp_config.password_encrypted)
-
-            return {
-                'host': smtp_config.host,
-                'port': smtp_config.port,
-                'username': smtp_config.username,
-                'password': password,
-                'use_tls': smtp_config.use_tls,
-                'use_ssl': smtp_config.use_ssl,
-                'from_email': smtp_config.from_email,
-                'from_name': smtp_config.from_name
-            }
+            # Password is decrypted on first use
+            return SMTPSettings(
+                host=smtp_config.host,
+                port=smtp_config.port,
+                username=smtp_config.username,
+                use_tls=smtp_config.use_tls,
+                use_ssl=smtp_config.use_ssl,
+                from_email=smtp_config.from_email,
+                from_name=smtp_config.from_name,
+                password_encrypted=smtp_config.password_encrypted
+            )
     finally:
         db.close()
 
     # Fall back to environment variables if no active config
-    return {
-        'host': os.getenv('SMTP_HOST', 'localhost'),
-        'port': int(os.getenv('SMTP_PORT', '587')),
-        'username': os.getenv('SMTP_USER', os.getenv('SMTP_USERNAME', '')),
-        'password': os.getenv('SMTP_PASSWORD', ''),
-        'use_tls': os.getenv('SMTP_USE_TLS', 'true').lower() == 'true',
-        'use_ssl': False,
-        'from_email': os.getenv('SMTP_FROM', os.getenv('SMTP_FROM_EMAIL', 'noreply@nx2git.local')),
-        'from_name': os.getenv('SMTP_FROM_NAME', 'Ninox2Git')
-    }
+    return SMTPSettings(
+        host=os.getenv('SMTP_HOST', 'localhost'),
+        port=int(os.getenv('SMTP_PORT', '587')),
+        username=os.getenv('SMTP_USER', os.getenv('SMTP_USERNAME', '')),
+        use_tls=os.getenv('SMTP_USE_TLS', 'true').lower() == 'true',
+        use_ssl=False,
+        from_email=os.getenv('SMTP_FROM', os.getenv('SMTP_FROM_EMAIL', 'noreply@nx2git.local')),
+        from_name=os.getenv('SMTP_FROM_NAME', 'Ninox2Git'),
+        password_plain=os.getenv('SMTP_PASSWORD', '')
+    )
 
 
 class EmailError(Exception):
@@ -75,14 +173,274 @@ class SMTPConfigError(EmailError):
     pass
 
 
+def _smtp_config_key(smtp_config: SMTPSettings) -> tuple:
+    """Identify the SMTP server and credentials of a configuration"""
+    return (
+        smtp_config.host,
+        smtp_config.port,
+        smtp_config.username,
+        smtp_config.password_encrypted or smtp_config.password_plain,
+        smtp_config.use_ssl,
+        smtp_config.use_tls,
+    )
+
+
+def _open_smtp_connection(smtp_config: SMTPSettings, timeout: Optional[float] = None) -> smtplib.SMTP:
+    """
+    Connect to the SMTP server, start TLS and log in if configured
+
+    Args:
+        smtp_config: SMTP configuration
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Connected (and authenticated) SMTP client
+    """
+    kwargs = {'timeout': timeout} if timeout is not None else {}
+    if smtp_config.use_ssl:
+        server = smtplib.SMTP_SSL(smtp_config.host, smtp_config.port, **kwargs)
+    else:
+        server = smtplib.SMTP(smtp_config.host, smtp_config.port, **kwargs)
+
+    try:
+        if smtp_config.use_tls and not smtp_config.use_ssl:
+            server.starttls()
+
+        # Login if credentials provided
+        if smtp_config.username and smtp_config.password:
+            _smtp_login(server, smtp_config)
+    except BaseException:
+        # Don't leak the socket; no QUIT round trip on a failed handshake
+        server.close()
+        raise
+
+    return server
+
+
+# AUTH mechanism that last succeeded per (host, port)
+_smtp_auth_mechanisms: dict[tuple[str, int], str] = {}
+
+
+def _smtp_login(server: smtplib.SMTP, smtp_config: SMTPSettings):
+    """
+    Authenticate an SMTP client
+
+    Works like SMTP.login(), but remembers the mechanism that succeeded for
+    the server, so later connections authenticate with it directly instead
+    of trying each advertised mechanism in turn.
+
+    Args:
+        server: Connected SMTP client
+        smtp_config: SMTP configuration
+
+    Raises:
+        smtplib.SMTPAuthenticationError: If the server rejected the credentials
+        smtplib.SMTPException: If the server offers no supported mechanism
+    """
+    server_key = (smtp_config.host, smtp_config.port)
+    server.ehlo_or_helo_if_needed()
+    if not server.has_extn('auth'):
+        raise smtplib.SMTPNotSupportedError("SMTP AUTH extension not supported by server.")
+
+    # Used by the auth_* callbacks of smtplib
+    server.user = smtp_config.username
+    server.password = smtp_config.password
+
+    mechanism = _smtp_auth_mechanisms.get(server_key)
+    if mechanism is not None:
+        mechanisms = [mechanism]
+    else:
+        advertised = server.esmtp_features['auth'].upper().split()
+        mechanisms = [m for m in SMTP_AUTH_PREFERENCE if m in advertised]
+        if not mechanisms:
+            raise smtplib.SMTPException("No suitable authentication method found.")
+
+    last_error = None
+    for mechanism in mechanisms:
+        authobject = getattr(server, 'auth_' + mechanism.lower().replace('-', '_'))
+        try:
+            server.auth(mechanism, authobject)
+        except smtplib.SMTPAuthenticationError as e:
+            last_error = e
+            continue
+        _smtp_auth_mechanisms[server_key] = mechanism
+        return
+
+    _smtp_auth_mechanisms.pop(server_key, None)
+    raise last_error
+
+
+def _close_smtp_connection(server: smtplib.SMTP):
+    """Close an SMTP client, ignoring errors from an already dead connection"""
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+class SMTPConnectionPool:
+    """
+    Pool of authenticated SMTP connections for one SMTP configuration.
+    Connections are reused across messages so the TCP/TLS/AUTH handshake
+    is paid once per connection instead of once per email.
+    """
+
+    def __init__(
+        self,
+        smtp_config: SMTPSettings,
+        max_connections: int = SMTP_POOL_MAX_CONNECTIONS,
+        idle_timeout: float = SMTP_POOL_IDLE_TIMEOUT
+    ):
+        """
+        Initialize connection pool
+
+        Args:
+            smtp_config: SMTP configuration
+            max_connections: Maximum number of open connections
+            idle_timeout: Seconds after which an idle connection is closed
+        """
+        self._config = smtp_config
+        self._idle_timeout = idle_timeout
+        self._reuse = smtp_config.host not in SMTP_POOL_DISABLED_HOSTS
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        # Set by close(): released connections are closed instead of kept idle
+        self._retired = False
+        self._retire_lock = threading.Lock()
+
+    def acquire(self, timeout: float = SMTP_POOL_WAIT_TIMEOUT) -> tuple[smtplib.SMTP, bool]:
+        """
+        Check out a connection, opening a new one if none is idle
+
+        Args:
+            timeout: Seconds to wait for a free connection slot
+
+        Returns:
+            Tuple of (SMTP client, whether it was reused from the pool)
+
+        Raises:
+            EmailError: If no connection slot became free in time
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise EmailError("Timed out waiting for a free SMTP connection")
+
+        server = self._pop_idle()
+        if server is not None:
+            return server, True
+
+        try:
+            return _open_smtp_connection(self._config), False
+        except Exception:
+            self._slots.release()
+            raise
+
+    def acquire_idle(self) -> Optional[smtplib.SMTP]:
+        """
+        Check out an idle connection without waiting or opening a new one
+
+        Returns:
+            Idle SMTP client, or None if none is available
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        server = self._pop_idle()
+        if server is None:
+            self._slots.release()
+        return server
+
+    def _pop_idle(self) -> Optional[smtplib.SMTP]:
+        """Take the most recently used idle connection, closing expired ones"""
+        now = time.monotonic()
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if now - last_used < self._idle_timeout:
+                return server
+            # Most likely already dropped by the server, skip the QUIT round trip
+            server.close()
+
+    def release(self, server: smtplib.SMTP, reusable: bool = True):
+        """
+        Return a connection to the pool
+
+        Args:
+            server: SMTP client from acquire()
+            reusable: False if the connection failed and must be closed
+        """
+        try:
+            if not reusable:
+                # Failed connection: close the socket without a QUIT round trip
+                server.close()
+            elif not self._keep_idle(server):
+                _close_smtp_connection(server)
+        finally:
+            self._slots.release()
+
+    def _keep_idle(self, server: smtplib.SMTP) -> bool:
+        """Queue a connection for reuse unless the pool doesn't keep connections"""
+        if not self._reuse:
+            return False
+        with self._retire_lock:
+            if self._retired:
+                return False
+            self._idle.put((server, time.monotonic()))
+            return True
+
+    def close(self):
+        """
+        Retire the pool and close all idle connections
+
+        Connections still checked out are closed when they are released.
+        """
+        with self._retire_lock:
+            self._retired = True
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close_smtp_connection(server)
+
+
+# Pool for the currently active SMTP configuration: (config key, pool)
+_smtp_pool: Optional[tuple[tuple, SMTPConnectionPool]] = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool(smtp_config: SMTPSettings) -> SMTPConnectionPool:
+    """
+    Get the connection pool for an SMTP configuration
+
+    A changed configuration (host, credentials, TLS settings) replaces the
+    pool and retires the previous one, closing its connections.
+
+    Args:
+        smtp_config: SMTP configuration
+
+    Returns:
+        SMTPConnectionPool for this configuration
+    """
+    global _smtp_pool
+    key = _smtp_config_key(smtp_config)
+    with _smtp_pool_lock:
+        if _smtp_pool is None or _smtp_pool[0] != key:
+            if _smtp_pool is not None:
+                _smtp_pool[1].close()
+            _smtp_pool = (key, SMTPConnectionPool(smtp_config))
+        return _smtp_pool[1]
+
+
 def create_email_message(
     to_email: str,
     subject: str,
     html_body: str,
     text_body: Optional[str] = None,
     from_email: Optional[str] = None,
-    from_name: Optional[str] = None
-) -> MIMEMultipart:
+    from_name: Optional[str] = None,
+    _smtp_config: Optional[SMTPSettings] = None
+) -> EmailMessage:
     """
     Create email message with HTML and optional text body
 
@@ -93,26 +451,29 @@ def create_email_message(
         text_body: Plain text email body (optional)
         from_email: Sender email (uses active SMTP config if not provided)
         from_name: Sender name (uses active SMTP config if not provided)
+        _smtp_config: Already resolved SMTP configuration (looked up if not provided)
 
     Returns:
-        MIMEMultipart email message
+        EmailMessage (multipart/alternative if a text body is given)
     """
     # Get active SMTP config for defaults
-    smtp_config = get_active_smtp_config()
+    smtp_config = _smtp_config or get_active_smtp_config()
 
-    message = MIMEMultipart('alternative')
+    message = EmailMessage()
     message['Subject'] = subject
-    message['From'] = f'{from_name or smtp_config["from_name"]} <{from_email or smtp_config["from_email"]}>'
+    message['From'] = Address(
+        from_name or smtp_config.from_name,
+        addr_spec=from_email or smtp_config.from_email
+    )
     message['To'] = to_email
 
-    # Add text part if provided
+    # Quoted-printable keeps mostly-ASCII bodies smaller than base64 and
+    # wraps the long lines of minified HTML
     if text_body:
-        text_part = MIMEText(text_body, 'plain')
-        message.attach(text_part)
-
-    # Add HTML part
-    html_part = MIMEText(html_body, 'html')
-    message.attach(html_part)
+        message.set_content(text_body, cte='quoted-printable')
+        message.add_alternative(html_body, subtype='html', cte='quoted-printable')
+    else:
+        message.set_content(html_body, subtype='html', cte='quoted-printable')
 
     return message
 
@@ -154,273 +515,243 @@ def send_email(
             html_body=html_body,
             text_body=text_body,
             from_email=from_email,
-            from_name=from_name
+            from_name=from_name,
+            _smtp_config=smtp_config
         )
 
-        # Connect to SMTP server
-        if smtp_config['use_ssl']:
-            server = smtplib.SMTP_SSL(smtp_config['host'], smtp_config['port'])
-        else:
-            server = smtplib.SMTP(smtp_config['host'], smtp_config['port'])
-            if smtp_config['use_tls']:
-                server.starttls()
+        # Send over a pooled connection; a reused connection may have been
+        # dropped by the server while idle, so retry once on a fresh one
+        pool = get_smtp_pool(smtp_config)
+        while True:
+            server, reused = pool.acquire()
+            try:
+                server.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                pool.release(server, reusable=False)
+                if reused:
+                    continue
+                raise
+            except Exception:
+                pool.release(server, reusable=False)
+                raise
+            pool.release(server)
+            return True
+
+    except EmailError:
+        raise
+    except smtplib.SMTPAuthenticationError as e:
+        raise SMTPConfigError(f"SMTP authentication failed: {str(e)}") from e
+    except smtplib.SMTPException as e:
+        raise EmailError(f"Failed to send email: {str(e)}") from e
+    except Exception as e:
+        raise EmailError(f"Unexpected error sending email: {str(e)}") from e
 
-        # Login if credentials provided
-        if smtp_config['username'] and smtp_config['password']:
-            server.login(smtp_config['username'], smtp_config['password'])
 
-        # Send email
-        server.send_message(message)
-        server.quit()
+def enqueue_email(
+    to_email: str,
+    subject: str,
+    html_body: str,
+    text_body: Optional[str] = None,
+    from_email: Optional[str] = None,
+    from_name: Optional[str] = None
+) -> Future:
+    """
+    Queue an email for delivery by the background email workers
 
-        return True
+    Returns immediately. Transient failures (4xx replies, dropped or failed
+    connections) are retried after EMAIL_RETRY_DELAYS; the wait runs on a
+    timer, so no queue worker is blocked. Permanent failures are not retried.
 
-    except smtplib.SMTPAuthenticationError as e:
-        raise SMTPConfigError(f"SMTP authentication failed: {str(e)}")
-    except smtplib.SMTPException as e:
-        raise EmailError(f"Failed to send email: {str(e)}")
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        html_body: HTML email body
+        text_body: Plain text email body (optional)
+        from_email: Sender email (uses active SMTP config if not provided)
+        from_name: Sender name (uses active SMTP config if not provided)
+
+    Returns:
+        Future resolving to True once the email has been sent, or to the
+        EmailError of the last attempt
+    """
+    result: Future = Future()
+    _submit_email_attempt(result, 0, {
+        'to_email': to_email,
+        'subject': subject,
+        'html_body': html_body,
+        'text_body': text_body,
+        'from_email': from_email,
+        'from_name': from_name,
+    })
+    return result
+
+
+def _submit_email_attempt(result: Future, attempt: int, message: dict):
+    """Queue one delivery attempt of an email"""
+    get_email_queue().submit(_send_email_attempt, result, attempt, message)
+
+
+def _send_email_attempt(result: Future, attempt: int, message: dict):
+    """
+    Make one delivery attempt and schedule the next one on transient failures
+    (runs on a queue worker)
+
+    Args:
+        result: Future returned by enqueue_email()
+        attempt: Number of previous attempts
+        message: Keyword arguments for send_email()
+    """
+    try:
+        result.set_result(send_email(**message))
+    except EmailError as e:
+        if attempt < len(EMAIL_RETRY_DELAYS) and _is_transient_email_error(e):
+            delay = EMAIL_RETRY_DELAYS[attempt]
+            logger.warning(f"Email to {message['to_email']} failed, retrying in {delay}s: {e}")
+            retry = threading.Timer(delay, _submit_email_attempt, (result, attempt + 1, message))
+            retry.daemon = True
+            retry.start()
+            return
+        logger.error(f"Failed to send email to {message['to_email']}: {e}")
+        result.set_exception(e)
     except Exception as e:
-        raise EmailError(f"Unexpected error sending email: {str(e)}")
+        logger.error(f"Failed to send email to {message['to_email']}: {e}")
+        result.set_exception(e)
 
 
-def get_email_base_template(content: str, title: str = "Ninox2Git") -> str:
+def _is_transient_email_error(error: EmailError) -> bool:
     """
-    Get base HTML email template
+    Check whether a failed delivery may succeed when retried later
 
     Args:
-        content: HTML content to insert into template
-        title: Email title
+        error: Error raised by send_email()
 
     Returns:
-        Complete HTML email template
-    """
-    return f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background-color: #f4f4f4;
-            margin: 0;
-            padding: 0;
-        }}
-        .container {{
-            max-width: 600px;
-            margin: 20px auto;
-            background-color: #ffffff;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            background-color: #2563eb;
-            color: #ffffff;
-            padding: 30px;
-            text-align: center;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 24px;
-            font-weight: 600;
-        }}
-        .content {{
-            padding: 30px;
-        }}
-        .button {{
-            display: inline-block;
-            padding: 12px 24px;
-            background-color: #2563eb;
-            color: #ffffff;
-            text-decoration: none;
-            border-radius: 5px;
-            font-weight: 500;
-            margin: 20px 0;
-        }}
-        .button:hover {{
-            background-color: #1d4ed8;
-        }}
-        .footer {{
-            background-color: #f8f9fa;
-            padding: 20px 30px;
-            text-align: center;
-            font-size: 14px;
-            color: #6c757d;
-            border-top: 1px solid #e9ecef;
-        }}
-        .alert {{
-            background-color: #fef3c7;
-            border-left: 4px solid #f59e0b;
-            padding: 12px;
-            margin: 20px 0;
-        }}
-        code {{
-            background-color: #f1f5f9;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-family: 'Courier New', monospace;
-            font-size: 14px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>{title}</h1>
-        </div>
-        <div class="content">
-            {content}
-        </div>
-        <div class="footer">
-            <p>&copy; {datetime.utcnow().year} Ninox2Git. All rights reserved.</p>
-            <p>This is an automated email. Please do not reply to this message.</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        True for 4xx replies and dropped or failed connections
+    """
+    if isinstance(error, SMTPConfigError):
+        return False
+    cause = error.__cause__
+    if cause is None:
+        # Raised by the pool: no free connection slot in time
+        return True
+    if isinstance(cause, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in cause.recipients.values())
+    if isinstance(cause, smtplib.SMTPResponseException):
+        return 400 <= cause.smtp_code < 500
+    if isinstance(cause, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(cause, smtplib.SMTPException):
+        return False
+    # Connection refused, timeouts, DNS failures
+    return isinstance(cause, OSError)
 
 
-def send_password_reset_email(
-    to_email: str,
-    username: str,
-    reset_token: str,
-    expires_hours: int = 24
-) -> bool:
+def _minify_html(markup: str) -> str:
     """
-    Send password reset email to user
+    Strip layout whitespace from an HTML template (applied once on load)
+
+    Whitespace between tags on separate lines is dropped, other whitespace
+    runs are collapsed and the CSS is compacted. The templates contain no
+    <pre> blocks, so the rendered email looks the same.
 
     Args:
-        to_email: User's email address
-        username: User's username
-        reset_token: Password reset token
-        expires_hours: Token expiration time in hours
+        markup: HTML template
 
     Returns:
-        True if email sent successfully, False otherwise
+        Minified HTML template
+    """
+    markup = re.sub(r'>\s*\n\s*<', '><', markup)
+    markup = re.sub(r'\s+', ' ', markup)
+    markup = re.sub(
+        r'<style>(.*?)</style>',
+        lambda m: '<style>' + re.sub(r'\s*([{};:,])\s*', r'\1', m.group(1)).strip() + '</style>',
+        markup,
+        flags=re.S
+    )
+    return markup.strip()
 
-    Raises:
-        EmailError: If email sending fails
+
+# HTML email templates (base.html plus one template per email)
+EMAIL_TEMPLATE_DIR = Path(__file__).parent / 'templates' / 'email'
+
+
+class _MinifyingLoader(FileSystemLoader):
+    """Template loader that minifies templates as they are loaded"""
+
+    def get_source(self, environment: Environment, template: str):
+        source, filename, uptodate = super().get_source(environment, template)
+        # Whitespace around {% ... %} tags is layout only as well
+        source = re.sub(r'\s*(\{%.*?%\})\s*', r'\1', source)
+        return _minify_html(source), filename, uptodate
+
+
+# Templates are compiled once per process, the bytecode cache also spares
+# recompiling them after a restart; autoescaping covers user-provided values
+_template_env = Environment(
+    loader=_MinifyingLoader(EMAIL_TEMPLATE_DIR),
+    autoescape=select_autoescape(['html']),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False
+)
+
+
+def _render_email_template(name: str, **context) -> str:
     """
-    # Create reset URL
-    reset_url = f"{APP_URL}/reset-password?token={reset_token}"
+    Render an HTML email template
 
-    # HTML content
-    html_content = f"""
-        <h2>Password Reset Request</h2>
-        <p>Hello <strong>{username}</strong>,</p>
-        <p>We received a request to reset the password for your Ninox2Git account.</p>
-        <p>Click the button below to reset your password:</p>
-        <p style="text-align: center;">
-            <a href="{reset_url}" class="button">Reset Password</a>
-        </p>
-        <p>Or copy and paste this link into your browser:</p>
-        <p><code>{reset_url}</code></p>
-        <div class="alert">
-            <strong>Security Notice:</strong>
-            <ul style="margin: 10px 0; padding-left: 20px;">
-                <li>This link will expire in {expires_hours} hours</li>
-                <li>If you didn't request this reset, please ignore this email</li>
-                <li>Your password will not be changed until you complete the reset process</li>
-            </ul>
-        </div>
+    Args:
+        name: Template file in EMAIL_TEMPLATE_DIR
+        **context: Template variables
+
+    Returns:
+        Complete HTML email
     """
+    return _template_env.get_template(name).render(year=_current_year(), **context)
 
-    # Plain text content
-    text_content = f"""
-Password Reset Request
 
-Hello {username},
+def _current_year() -> int:
+    """Current UTC year for email footers, computed at most once per day"""
+    return _year_of_day(int(time.time() // 86400))
 
-We received a request to reset the password for your Ninox2Git account.
 
-Click the link below to reset your password:
-{reset_url}
+@lru_cache(maxsize=2)
+def _year_of_day(day: int) -> int:
+    """UTC year of a day number (days since the epoch)"""
+    return datetime.utcfromtimestamp(day * 86400).year
 
-Security Notice:
-- This link will expire in {expires_hours} hours
-- If you didn't request this reset, please ignore this email
-- Your password will not be changed until you complete the reset process
 
+_TEXT_FOOTER_TEMPLATE = """
 ---
-© {datetime.utcnow().year} Ninox2Git. All rights reserved.
+© {year} Ninox2Git. All rights reserved.
 This is an automated email. Please do not reply to this message.
 """
 
-    # Create complete HTML email
-    html_body = get_email_base_template(html_content, "Password Reset - Ninox2Git")
 
-    # Send email
-    return send_email(
-        to_email=to_email,
-        subject="Reset Your Ninox2Git Password",
-        html_body=html_body,
-        text_body=text_content
-    )
+@lru_cache(maxsize=2)
+def _text_footer(year: int) -> str:
+    """Footer appended to every plain-text email, rendered once per year"""
+    return _TEXT_FOOTER_TEMPLATE.format(year=year)
 
 
-def send_welcome_email(
-    to_email: str,
-    username: str,
-    full_name: Optional[str] = None
-) -> bool:
-    """
-    Send welcome email to newly registered user
+# Plain-text email bodies (without footer), rendered with str.format_map() by
+# the send_*_email functions (the HTML bodies are templates in EMAIL_TEMPLATE_DIR)
+_PASSWORD_RESET_TEXT = """
+Password Reset Request
 
-    Args:
-        to_email: User's email address
-        username: User's username
-        full_name: User's full name (optional)
+Hello {username},
 
-    Returns:
-        True if email sent successfully, False otherwise
+We received a request to reset the password for your Ninox2Git account.
 
-    Raises:
-        EmailError: If email sending fails
-    """
-    # Use full name if available, otherwise username
-    display_name = full_name or username
+Click the link below to reset your password:
+{reset_url}
 
-    # HTML content
-    html_content = f"""
-        <h2>Welcome to Ninox2Git!</h2>
-        <p>Hello <strong>{display_name}</strong>,</p>
-        <p>Thank you for registering with Ninox2Git! Your account has been successfully created.</p>
-
-        <h3>Account Details:</h3>
-        <ul>
-            <li><strong>Username:</strong> {username}</li>
-            <li><strong>Email:</strong> {to_email}</li>
-        </ul>
-
-        <h3>Getting Started:</h3>
-        <p>Ninox2Git helps you synchronize your Ninox databases with Git repositories for version control and backup.</p>
-        <ul>
-            <li>Connect your Ninox servers</li>
-            <li>Configure database synchronization</li>
-            <li>Set up automated Git backups</li>
-            <li>Track changes and collaborate with your team</li>
-        </ul>
-
-        <p style="text-align: center;">
-            <a href="{APP_URL}/login" class="button">Login to Your Account</a>
-        </p>
-
-        <div class="alert">
-            <strong>Security Tip:</strong> Keep your password secure and never share it with anyone.
-        </div>
-
-        <p>If you have any questions or need assistance, please don't hesitate to contact our support team.</p>
-        <p>Happy syncing!</p>
-    """
+Security Notice:
+- This link will expire in {expires_hours} hours
+- If you didn't request this reset, please ignore this email
+- Your password will not be changed until you complete the reset process
+"""
 
-    # Plain text content
-    text_content = f"""
+_WELCOME_TEXT = """
 Welcome to Ninox2Git!
 
 Hello {display_name},
@@ -439,99 +770,175 @@ Ninox2Git helps you synchronize your Ninox databases with Git repositories for v
 - Set up automated Git backups
 - Track changes and collaborate with your team
 
-Login to your account: {APP_URL}/login
+Login to your account: {app_url}/login
 
 Security Tip: Keep your password secure and never share it with anyone.
 
 If you have any questions or need assistance, please don't hesitate to contact our support team.
 
 Happy syncing!
+"""
 
----
-© {datetime.utcnow().year} Ninox2Git. All rights reserved.
-This is an automated email. Please do not reply to this message.
+_PASSWORD_CHANGED_TEXT = """
+Password Changed
+
+Hello {username},
+
+This email confirms that your Ninox2Git account password has been successfully changed.
+
+Change Time: {changed_at}
+
+Didn't make this change?
+If you did not change your password, please contact support immediately and secure your account.
+
+For your security, here are some best practices:
+- Use a strong, unique password
+- Don't share your password with anyone
+- Enable two-factor authentication if available
+- Regularly update your password
 """
 
-    # Create complete HTML email
-    html_body = get_email_base_template(html_content, "Welcome to Ninox2Git!")
+_ACCOUNT_DEACTIVATED_TEXT = """
+Account Deactivated
 
-    # Send email
-    return send_email(
-        to_email=to_email,
-        subject="Welcome to Ninox2Git!",
-        html_body=html_body,
-        text_body=text_content
-    )
+Hello {username},
 
+Your Ninox2Git account has been deactivated by an administrator.
 
-def send_password_changed_email(
+Deactivated By: {admin_username}
+Deactivation Time: {deactivated_at}
+
+What this means:
+You will no longer be able to log in to your account until it is reactivated by an administrator.
+
+If you believe this was done in error or have questions, please contact your system administrator.
+"""
+
+
+def send_password_reset_email(
     to_email: str,
-    username: str
-) -> bool:
+    username: str,
+    reset_token: str,
+    expires_hours: int = 24
+) -> Future:
     """
-    Send notification email when password is changed
+    Send password reset email to user
 
     Args:
         to_email: User's email address
         username: User's username
+        reset_token: Password reset token
+        expires_hours: Token expiration time in hours
 
     Returns:
-        True if email sent successfully, False otherwise
-
-    Raises:
-        EmailError: If email sending fails
+        Future resolving to True once the email has been sent
     """
+    # Create reset URL
+    reset_url = f"{APP_URL}/reset-password?token={quote(reset_token, safe='')}"
+
     # HTML content
-    html_content = f"""
-        <h2>Password Changed</h2>
-        <p>Hello <strong>{username}</strong>,</p>
-        <p>This email confirms that your Ninox2Git account password has been successfully changed.</p>
+    html_body = _render_email_template(
+        'password_reset.html',
+        title="Password Reset - Ninox2Git",
+        expires_hours=expires_hours,
+        reset_url=reset_url,
+        username=username
+    )
 
-        <p><strong>Change Time:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+    # Plain text content
+    text_content = _PASSWORD_RESET_TEXT.format_map({
+        'expires_hours': expires_hours,
+        'reset_url': reset_url,
+        'username': username
+    }) + _text_footer(_current_year())
+
+    # Queue email - delivery and retries happen on the email workers
+    return enqueue_email(
+        to_email=to_email,
+        subject="Reset Your Ninox2Git Password",
+        html_body=html_body,
+        text_body=text_content
+    )
 
-        <div class="alert">
-            <strong>Didn't make this change?</strong><br>
-            If you did not change your password, please contact support immediately and secure your account.
-        </div>
 
-        <p>For your security, here are some best practices:</p>
-        <ul>
-            <li>Use a strong, unique password</li>
-            <li>Don't share your password with anyone</li>
-            <li>Enable two-factor authentication if available</li>
-            <li>Regularly update your password</li>
-        </ul>
+def send_welcome_email(
+    to_email: str,
+    username: str,
+    full_name: Optional[str] = None
+) -> Future:
     """
+    Send welcome email to newly registered user
 
-    # Plain text content
-    text_content = f"""
-Password Changed
+    Args:
+        to_email: User's email address
+        username: User's username
+        full_name: User's full name (optional)
 
-Hello {username},
+    Returns:
+        Future resolving to True once the email has been sent
+    """
+    # Use full name if available, otherwise username
+    display_name = full_name or username
 
-This email confirms that your Ninox2Git account password has been successfully changed.
+    # HTML content
+    html_body = _render_email_template(
+        'welcome.html',
+        title="Welcome to Ninox2Git!",
+        app_url=APP_URL,
+        display_name=display_name,
+        to_email=to_email,
+        username=username
+    )
 
-Change Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
+    # Plain text content
+    text_content = _WELCOME_TEXT.format_map({
+        'app_url': APP_URL,
+        'display_name': display_name,
+        'to_email': to_email,
+        'username': username
+    }) + _text_footer(_current_year())
+
+    # Queue email - delivery and retries happen on the email workers
+    return enqueue_email(
+        to_email=to_email,
+        subject="Welcome to Ninox2Git!",
+        html_body=html_body,
+        text_body=text_content
+    )
 
-Didn't make this change?
-If you did not change your password, please contact support immediately and secure your account.
 
-For your security, here are some best practices:
-- Use a strong, unique password
-- Don't share your password with anyone
-- Enable two-factor authentication if available
-- Regularly update your password
+def send_password_changed_email(
+    to_email: str,
+    username: str
+) -> Future:
+    """
+    Send notification email when password is changed
 
----
-© {datetime.utcnow().year} Ninox2Git. All rights reserved.
-This is an automated email. Please do not reply to this message.
-"""
+    Args:
+        to_email: User's email address
+        username: User's username
 
-    # Create complete HTML email
-    html_body = get_email_base_template(html_content, "Password Changed - Ninox2Git")
+    Returns:
+        Future resolving to True once the email has been sent
+    """
+    changed_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
 
-    # Send email
-    return send_email(
+    # HTML content
+    html_body = _render_email_template(
+        'password_changed.html',
+        title="Password Changed - Ninox2Git",
+        changed_at=changed_at,
+        username=username
+    )
+
+    # Plain text content
+    text_content = _PASSWORD_CHANGED_TEXT.format_map({
+        'changed_at': changed_at,
+        'username': username
+    }) + _text_footer(_current_year())
+
+    # Queue email - delivery and retries happen on the email workers
+    return enqueue_email(
         to_email=to_email,
         subject="Your Ninox2Git Password Has Been Changed",
         html_body=html_body,
@@ -543,7 +950,7 @@ def send_account_deactivated_email(
     to_email: str,
     username: str,
     admin_username: str
-) -> bool:
+) -> Future:
     """
     Send notification email when account is deactivated
 
@@ -553,88 +960,123 @@ def send_account_deactivated_email(
         admin_username: Username of admin who deactivated the account
 
     Returns:
-        True if email sent successfully, False otherwise
-
-    Raises:
-        EmailError: If email sending fails
+        Future resolving to True once the email has been sent
     """
+    deactivated_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+
     # HTML content
-    html_content = f"""
-        <h2>Account Deactivated</h2>
-        <p>Hello <strong>{username}</strong>,</p>
-        <p>Your Ninox2Git account has been deactivated by an administrator.</p>
+    html_body = _render_email_template(
+        'account_deactivated.html',
+        title="Account Deactivated - Ninox2Git",
+        admin_username=admin_username,
+        deactivated_at=deactivated_at,
+        username=username
+    )
 
-        <p><strong>Deactivated By:</strong> {admin_username}</p>
-        <p><strong>Deactivation Time:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+    # Plain text content
+    text_content = _ACCOUNT_DEACTIVATED_TEXT.format_map({
+        'admin_username': admin_username,
+        'deactivated_at': deactivated_at,
+        'username': username
+    }) + _text_footer(_current_year())
+
+    # Queue email - delivery and retries happen on the email workers
+    return enqueue_email(
+        to_email=to_email,
+        subject="Your Ninox2Git Account Has Been Deactivated",
+        html_body=html_body,
+        text_body=text_content
+    )
 
-        <div class="alert">
-            <strong>What this means:</strong><br>
-            You will no longer be able to log in to your account until it is reactivated by an administrator.
-        </div>
 
-        <p>If you believe this was done in error or have questions, please contact your system administrator.</p>
+def test_smtp_connection(force: bool = False) -> tuple[bool, str]:
     """
+    Test SMTP connection and configuration
 
-    # Plain text content
-    text_content = f"""
-Account Deactivated
+    Results are cached per SMTP configuration for SMTP_TEST_CACHE_TTL
+    seconds, and an idle pooled connection is checked with NOOP, so repeated
+    checks don't each pay a full TCP/TLS/AUTH handshake.
 
-Hello {username},
+    Args:
+        force: Bypass the cache and always connect to the server
 
-Your Ninox2Git account has been deactivated by an administrator.
+    Returns:
+        Tuple of (success, message)
+    """
+    global _smtp_test_cache
 
-Deactivated By: {admin_username}
-Deactivation Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
+    try:
+        # Get active SMTP configuration
+        smtp_config = get_active_smtp_config()
+    except Exception as e:
+        return False, f"Connection error: {str(e)}"
 
-What this means:
-You will no longer be able to log in to your account until it is reactivated by an administrator.
+    cache_key = _smtp_config_key(smtp_config)
+    now = time.monotonic()
+    if not force and _smtp_test_cache is not None:
+        cached_key, cached_at, cached_result = _smtp_test_cache
+        if cached_key == cache_key and now - cached_at < SMTP_TEST_CACHE_TTL:
+            return cached_result
 
-If you believe this was done in error or have questions, please contact your system administrator.
+    result = None if force else _check_pooled_smtp_connection(smtp_config)
+    if result is None:
+        result = _check_smtp_connection(smtp_config)
+    _smtp_test_cache = (cache_key, now, result)
+    return result
 
----
-© {datetime.utcnow().year} Ninox2Git. All rights reserved.
-This is an automated email. Please do not reply to this message.
-"""
 
-    # Create complete HTML email
-    html_body = get_email_base_template(html_content, "Account Deactivated - Ninox2Git")
+def _check_pooled_smtp_connection(smtp_config: SMTPSettings) -> Optional[tuple[bool, str]]:
+    """
+    Check the SMTP server with NOOP over an idle pooled connection
 
-    # Send email
-    return send_email(
-        to_email=to_email,
-        subject="Your Ninox2Git Account Has Been Deactivated",
-        html_body=html_body,
-        text_body=text_content
-    )
+    Args:
+        smtp_config: SMTP configuration
+
+    Returns:
+        Tuple of (success, message), or None if no usable pooled connection exists
+    """
+    pool = _smtp_pool
+    if pool is None or pool[0] != _smtp_config_key(smtp_config):
+        return None
+
+    server = pool[1].acquire_idle()
+    if server is None:
+        return None
+    try:
+        code, _ = server.noop()
+    except (smtplib.SMTPException, OSError):
+        pool[1].release(server, reusable=False)
+        return None
+    pool[1].release(server, reusable=code == 250)
 
+    if code != 250:
+        return None
+    return True, _smtp_success_message(smtp_config)
 
-def test_smtp_connection() -> tuple[bool, str]:
+
+def _smtp_success_message(smtp_config: SMTPSettings) -> str:
+    """Result message of a successful connection check"""
+    if smtp_config.username and smtp_config.password:
+        return f"SMTP connection successful (authenticated) - {smtp_config.host}:{smtp_config.port}"
+    return f"SMTP connection successful (no authentication) - {smtp_config.host}:{smtp_config.port}"
+
+
+def _check_smtp_connection(smtp_config: SMTPSettings) -> tuple[bool, str]:
     """
-    Test SMTP connection and configuration
+    Connect and authenticate against the SMTP server
+
+    Args:
+        smtp_config: SMTP configuration
 
     Returns:
         Tuple of (success, message)
     """
     try:
-        # Get active SMTP configuration
-        smtp_config = get_active_smtp_config()
+        # Connect to SMTP server (and log in if credentials provided)
+        server = _open_smtp_connection(smtp_config, timeout=10)
+        _close_smtp_connection(server)
 
-        # Connect to SMTP server
-        if smtp_config['use_ssl']:
-            server = smtplib.SMTP_SSL(smtp_config['host'], smtp_config['port'], timeout=10)
-        else:
-            server = smtplib.SMTP(smtp_config['host'], smtp_config['port'], timeout=10)
-            if smtp_config['use_tls']:
-                server.starttls()
-
-        # Login if credentials provided
-        if smtp_config['username'] and smtp_config['password']:
-            server.login(smtp_config['username'], smtp_config['password'])
-            server.quit()
-            return True, f"SMTP connection successful (authenticated) - {smtp_config['host']}:{smtp_config['port']}"
-        else:
-            server.quit()
-            return True, f"SMTP connection successful (no authentication) - {smtp_config['host']}:{smtp_config['port']}"
+        return True, _smtp_success_message(smtp_config)
 
     except smtplib.SMTPAuthenticationError as e:
         return False, f"SMTP authentication failed: {str(e)}"
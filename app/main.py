@@ -5,19 +5,51 @@ Main NiceGUI application entry point with authentication and routing
 import os
 import logging
 import asyncio
-from typing import Optional
+import functools
+import hmac
+import inspect
+import time
+from typing import Callable, Optional
 from nicegui import app, ui
-from contextlib import asynccontextmanager
-
-from .database import init_db, get_db
-from .auth import create_admin_user, get_user_from_token, InvalidTokenError
-from .ui import login, dashboard, servers, teams, sync, admin, profile, cronjobs, json_viewer, code_viewer, yaml_code_viewer, changes
-from .services.cronjob_scheduler import get_scheduler
-
-# Configure logging
+from starlette.requests import Request
+from starlette.responses import RedirectResponse
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from .database import (
+    init_db, get_db_context, get_pool_status, current_db, request_db_scope,
+    DB_POOL_SIZE, DB_POOL_OVERFLOW
+)
+from .auth import (
+    create_admin_user, get_user_from_payload, get_token_user_id, validate_jwt_token, is_well_formed_token, record_logout,
+    login_or_create_oauth_user, InvalidTokenError, InactiveUserError,
+    OAuthDomainNotAllowedError, TOKEN_HASH_KEY
+)
+from .auth_cache import get_cached_user, cache_user, forget_token
+from .dto import UserDTO
+from .session import get_session_token, set_session_token, clear_session_token
+from .utils import hash_token
+from .services.oauth_service import get_oauth_service, OAuthError
+# Page modules (app.ui.*) are imported by their page handlers on first visit,
+# so startup doesn't load the dependencies of pages nobody opens
+
+# VS Code integration is optional - the app runs without it
+try:
+    from .api.vscode_proxy import router as vscode_router
+    vscode_import_error = None
+except Exception as e:
+    vscode_router = None
+    vscode_import_error = e
+
+# Configure logging - records don't need thread/process info, and a fixed
+# datefmt skips the millisecond formatting of asctime
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
@@ -25,34 +57,192 @@ logger = logging.getLogger(__name__)
 APP_TITLE = "Ninox2Git"
 APP_PORT = int(os.getenv('APP_PORT', '8765'))
 APP_HOST = os.getenv('APP_HOST', '0.0.0.0')
+SESSION_SECRET = os.getenv('SESSION_SECRET', 'change-this-secret-in-production')
+
+# Redirect targets and messages shared by the page handlers
+LOGIN_URL = '/login'
+DASHBOARD_URL = '/dashboard'
+SYNC_URL = '/sync'
+ADMIN_REQUIRED_MSG = 'Admin privileges required'
+
+# Pages that need a login. Without NiceGUI's session cookie (set by its
+# SessionMiddleware, it carries the browser id) there can be no stored token,
+# so these are redirected to the login page before any page is built.
+SESSION_COOKIE = 'session'
+PROTECTED_PATHS = frozenset({
+    '/', DASHBOARD_URL, '/servers', '/teams', SYNC_URL, '/admin', '/profile',
+    '/cronjobs', '/json-viewer', '/code-viewer', '/changes', '/yaml-code-viewer',
+})
+
+# Add a Server-Timing header with auth and render phase durations to responses
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING', 'false').lower() == 'true'
+
+# Signed cookie carrying the OAuth state between /auth/google and the callback
+OAUTH_STATE_COOKIE = 'oauth_state'
+OAUTH_STATE_MAX_AGE = 600
+
+# Messages shown on the login page for ?oauth_error=<reason> after a failed callback
+OAUTH_ERROR_MESSAGES = {
+    'denied': 'Google Anmeldung fehlgeschlagen',
+    'no_code': 'Keine Autorisierung erhalten',
+    'not_configured': 'Google OAuth ist nicht konfiguriert',
+    'state': 'Sicherheitsfehler. Bitte erneut versuchen.',
+    'domain': 'Die Domain Ihrer E-Mail-Adresse ist nicht erlaubt.',
+    'inactive': 'Ihr Benutzerkonto ist deaktiviert',
+    'failed': 'Anmeldung fehlgeschlagen',
+    'unexpected': 'Ein unerwarteter Fehler ist aufgetreten',
+}
+
+# Maximum number of session tokens resolved against the database at once.
+# Defaults to the pool capacity - more lookups would only queue for a connection.
+AUTH_MAX_CONCURRENCY = int(os.getenv('AUTH_MAX_CONCURRENCY', str(DB_POOL_SIZE + DB_POOL_OVERFLOW)))
+
+# Phase durations (ms) of the current request, None outside timed requests.
+# A dict is shared so worker threads (asyncio.to_thread) can record into it.
+_server_timings: ContextVar[Optional[dict[str, float]]] = ContextVar('server_timings', default=None)
+
+# Bounds DB sessions and worker threads used by page authentication
+_auth_semaphore = asyncio.Semaphore(AUTH_MAX_CONCURRENCY)
+
+
+def resolve_user(token: str) -> UserDTO:
+    """
+    Resolve a session token to its user
+
+    Results are kept in the auth_cache, so page navigations skip JWT
+    verification and the users query. UserDTOs are immutable and safe to share.
+
+    Args:
+        token: JWT token
+
+    Returns:
+        UserDTO of the token's user
+
+    Raises:
+        InvalidTokenError: If token is invalid
+        UserNotFoundError: If user not found
+        InactiveUserError: If user is inactive
+    """
+    user = get_cached_user(token)
+    if user is not None:
+        return user
 
-# Session storage key for JWT token
-SESSION_TOKEN_KEY = 'jwt_token'
+    with timed('auth_decode'):
+        payload = validate_jwt_token(token)
+    with timed('auth_db'):
+        db = current_db()
+        user = get_user_from_payload(db, payload)
+        # End the transaction here, so the connection goes back to the pool
+        # instead of idling in transaction while the page renders
+        db.commit()
 
+    cache_user(token, user, payload['exp'])
+    return user
+
+
+async def resolve_user_async(token: str) -> UserDTO:
+    """
+    Resolve a session token to its user without blocking the event loop
+
+    Cache hits are answered directly. Misses run resolve_user() in a worker
+    thread, at most AUTH_MAX_CONCURRENCY at a time, so bursts of page loads
+    can't exhaust the database pool.
+
+    Args:
+        token: JWT token
 
-def get_current_user():
+    Returns:
+        UserDTO of the token's user
+
+    Raises:
+        InvalidTokenError: If token is invalid
+        UserNotFoundError: If user not found
+        InactiveUserError: If user is inactive
+    """
+    user = get_cached_user(token)
+    if user is not None:
+        return user
+
+    async with _auth_semaphore:
+        return await asyncio.to_thread(resolve_user, token)
+
+
+@contextmanager
+def timed(name: str):
+    """
+    Record the duration of a block for the Server-Timing header
+
+    Does nothing unless SERVER_TIMING is enabled.
+
+    Args:
+        name: Phase name, e.g. 'auth_db'
+    """
+    timings = _server_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+@app.middleware('http')
+async def request_db_session(request: Request, call_next):
+    """Share one lazily opened database session per HTTP request (current_db())"""
+    async with request_db_scope():
+        return await call_next(request)
+
+
+@app.middleware('http')
+async def auth_gate(request: Request, call_next):
+    """Redirect requests for protected pages without a session cookie to the login page"""
+    if request.url.path in PROTECTED_PATHS and SESSION_COOKIE not in request.cookies:
+        return RedirectResponse(LOGIN_URL, status_code=307)
+    return await call_next(request)
+
+
+if SERVER_TIMING_ENABLED:
+    @app.middleware('http')
+    async def server_timing(request: Request, call_next):
+        """Report request phase durations in a Server-Timing header"""
+        timings: dict[str, float] = {}
+        _server_timings.set(timings)
+        start = time.perf_counter()
+        response = await call_next(request)
+        timings['total'] = (time.perf_counter() - start) * 1000
+        response.headers['Server-Timing'] = ', '.join(
+            f'{name};dur={duration:.1f}' for name, duration in timings.items()
+        )
+        return response
+
+
+async def get_current_user():
     """
     Get current authenticated user from session token
 
     Returns:
         User object if authenticated, None otherwise
     """
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
+    token = get_session_token()
     if not token:
         return None
 
+    if not is_well_formed_token(token):
+        logger.warning("Malformed token in session")
+        clear_session_token()
+        return None
+
     try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-        return user
+        return await resolve_user_async(token)
     except (InvalidTokenError, Exception) as e:
-        logger.warning(f"Invalid token in session: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
+        logger.warning("Invalid token in session: %s", e)
+        clear_session_token()
         return None
 
 
-def require_auth():
+async def require_auth():
     """
     Middleware to require authentication
     Redirects to login if not authenticated
@@ -60,14 +250,14 @@ def require_auth():
     Returns:
         User object if authenticated, None if not authenticated
     """
-    user = get_current_user()
+    user = await get_current_user()
     if not user:
-        ui.navigate.to('/login')
+        ui.navigate.to(LOGIN_URL)
         return None
     return user
 
 
-def require_admin():
+async def require_admin():
     """
     Middleware to require admin privileges
     Redirects to dashboard if not admin
@@ -75,289 +265,210 @@ def require_admin():
     Returns:
         User object if authenticated and admin
     """
-    user = require_auth()
+    # Tokens carry the is_admin claim - deny non-admins before any DB lookup.
+    # Admin claims are still confirmed against the database below.
+    if not _token_claims_admin(get_session_token()):
+        return _deny_admin()
+
+    user = await require_auth()
     if user and not user.is_admin:
-        ui.notify('Admin privileges required', type='negative')
-        ui.navigate.to('/dashboard')
-        return None
+        return _deny_admin()
     return user
 
 
+def _deny_admin() -> None:
+    """Send a non-admin user back to the dashboard"""
+    ui.notify(ADMIN_REQUIRED_MSG, type='negative')
+    ui.navigate.to(DASHBOARD_URL)
+    return None
+
+
+def _token_claims_admin(token: Optional[str]) -> bool:
+    """Check the is_admin claim of a session token, True if it can't be decided yet"""
+    if not token or get_cached_user(token) is not None:
+        # Missing tokens are redirected to login, cached users are checked directly
+        return True
+    try:
+        return bool(validate_jwt_token(token).get('is_admin'))
+    except InvalidTokenError:
+        return True
+
+
+def authenticated(page: Callable) -> Callable:
+    """
+    Decorator for page handlers that require a logged-in user
+
+    Redirects to the login page if the session has no valid token, otherwise
+    calls the handler with the user as first argument. The returned handler is
+    async so the token lookup doesn't block the event loop.
+
+    Args:
+        page: Page handler taking the user as first argument
+
+    Returns:
+        Page handler without the user argument (for @ui.page)
+    """
+    @functools.wraps(page)
+    async def wrapper(*args, **kwargs):
+        user = await require_auth()
+        if not user:
+            return None
+        with timed('render'):
+            return page(user, *args, **kwargs)
+
+    return _without_user_parameter(wrapper, page)
+
+
+def admin_only(page: Callable) -> Callable:
+    """
+    Decorator for page handlers that require an admin user
+
+    Like authenticated(), but non-admin users are sent to the dashboard.
+
+    Args:
+        page: Page handler taking the user as first argument
+
+    Returns:
+        Page handler without the user argument (for @ui.page)
+    """
+    @functools.wraps(page)
+    async def wrapper(*args, **kwargs):
+        user = await require_admin()
+        if not user:
+            return None
+        with timed('render'):
+            return page(user, *args, **kwargs)
+
+    return _without_user_parameter(wrapper, page)
+
+
+def _without_user_parameter(wrapper: Callable, page: Callable) -> Callable:
+    """Hide the user parameter so NiceGUI only maps the remaining ones to query parameters"""
+    signature = inspect.signature(page)
+    wrapper.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return wrapper
+
+
 @ui.page('/')
 def index():
     """Root page - redirect to sync or login"""
-    user = get_current_user()
-    if user:
-        ui.navigate.to('/sync')
-    else:
-        ui.navigate.to('/login')
+    # The token is validated by the target page, no lookup needed here
+    ui.navigate.to(SYNC_URL if get_session_token() else LOGIN_URL)
     return None
 
 
-@ui.page('/login')
-def login_page():
+@ui.page(LOGIN_URL)
+async def login_page(oauth_error: Optional[str] = None):
     """Login and registration page"""
-    user = get_current_user()
+    user = await get_current_user()
     if user:
-        ui.navigate.to('/dashboard')
+        ui.navigate.to(DASHBOARD_URL)
         return None
 
+    from .ui import login
     login.render()
+    if oauth_error in OAUTH_ERROR_MESSAGES:
+        ui.notify(OAUTH_ERROR_MESSAGES[oauth_error], type='negative')
     return None
 
 
-@ui.page('/dashboard')
-def dashboard_page():
-    """Main dashboard page"""
-    # Check authentication BEFORE rendering anything
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    logger.debug(f"Dashboard access - token present: {bool(token)}, length: {len(token) if token else 0}")
-    
-    if not token:
-        logger.warning("Dashboard access denied: no token in session - redirecting to login")
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-        logger.debug(f"Dashboard access granted for user: {user.username if user else 'None'}")
-    except Exception as e:
-        logger.error(f"Auth error on dashboard: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
-    # Only render if we have a valid user
+@ui.page(DASHBOARD_URL)
+@authenticated
+def dashboard_page(user, oauth_login: bool = False):
+    """Main dashboard page, greeting the user after a Google login"""
+    from .ui import dashboard
     dashboard.render(user)
+    if oauth_login:
+        ui.notify(f'Willkommen, {user.full_name or user.username}!', type='positive')
     return None
 
 
 @ui.page('/servers')
-def servers_page():
+@authenticated
+def servers_page(user):
     """Server management page"""
-    # Check authentication BEFORE rendering anything
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import servers
     servers.render(user)
     return None
 
 
 @ui.page('/teams')
-def teams_page():
+@authenticated
+def teams_page(user):
     """Team management page"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import teams
     teams.render(user)
     return None
 
 
-@ui.page('/sync')
-def sync_page(server: int = None, team: int = None):
+@ui.page(SYNC_URL)
+@authenticated
+def sync_page(user, server: int = None, team: int = None):
     """Synchronization page with optional server and team parameters"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
-    # Pass server and team parameters to render function
+    from .ui import sync
     sync.render(user, server_id_param=server, team_id_param=team)
     return None
 
 
 @ui.page('/admin')
-def admin_page():
+@admin_only
+def admin_page(user):
     """Admin panel page - admin only"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-
-        # Additional admin check
-        if not user.is_admin:
-            ui.notify('Admin privileges required', type='negative')
-            ui.navigate.to('/dashboard')
-            return None
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import admin
     admin.render(user)
     return None
 
 
 @ui.page('/profile')
-def profile_page():
+@authenticated
+def profile_page(user):
     """User profile page"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import profile
     profile.render(user)
     return None
 
 
 @ui.page('/cronjobs')
-def cronjobs_page():
+@authenticated
+def cronjobs_page(user):
     """Cronjob management page"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import cronjobs
     cronjobs.render(user)
     return None
 
 
 @ui.page('/json-viewer')
-def json_viewer_page():
+@authenticated
+def json_viewer_page(user):
     """JSON Viewer page"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import json_viewer
     json_viewer.render(user)
     return None
 
 
 @ui.page('/code-viewer')
-def code_viewer_page():
+@authenticated
+def code_viewer_page(user):
     """Ninox Code Viewer page"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import code_viewer
     code_viewer.render(user)
     return None
 
 
 @ui.page('/changes')
-def changes_page():
+@authenticated
+def changes_page(user):
     """Changes/Changelog page"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import changes
     changes.render(user)
     return None
 
 
 @ui.page('/yaml-code-viewer')
-def yaml_code_viewer_page():
+@authenticated
+def yaml_code_viewer_page(user):
     """YAML Code Viewer page for ninox-dev-cli files"""
-    token = app.storage.user.get(SESSION_TOKEN_KEY)
-    if not token:
-        ui.navigate.to('/login')
-        return None
-
-    try:
-        db = get_db()
-        user = get_user_from_token(db, token)
-        db.close()
-    except Exception as e:
-        logger.error(f"Auth error: {e}")
-        app.storage.user.pop(SESSION_TOKEN_KEY, None)
-        ui.navigate.to('/login')
-        return None
-
+    from .ui import yaml_code_viewer
     yaml_code_viewer.render(user)
     return None
 
@@ -366,18 +477,14 @@ def yaml_code_viewer_page():
 # OAuth Routes
 # ============================================================================
 
-@ui.page('/auth/google')
+@app.get('/auth/google')
 def google_auth_start():
-    """Start Google OAuth flow - redirects to Google"""
-    from .services.oauth_service import get_oauth_service
+    """Start Google OAuth flow - plain 302 to Google, no NiceGUI page"""
     # Google Drive removed - no longer used
-    from starlette.responses import RedirectResponse
-    
     oauth_service = get_oauth_service()
     if not oauth_service:
-        ui.notify('Google OAuth ist nicht konfiguriert', type='negative')
-        ui.navigate.to('/login')
-        return None
+        logger.warning("Google OAuth requested but not configured")
+        return RedirectResponse(LOGIN_URL, status_code=302)
 
     # Google Drive removed - no longer request Drive scopes
     include_drive = False
@@ -385,148 +492,165 @@ def google_auth_start():
     # Generate auth URL and redirect
     auth_url, state = oauth_service.generate_auth_url(include_drive=include_drive)
     
-    # Store state in session for validation
-    app.storage.user['oauth_state'] = state
-    
-    # Show loading message and redirect via meta refresh
-    with ui.column().classes('w-full h-screen items-center justify-center'):
-        ui.spinner(size='xl')
-        ui.label('Weiterleitung zu Google...').classes('text-h6 mt-4')
-        # Use HTML meta refresh as fallback
-        ui.html(f'<meta http-equiv="refresh" content="0;url={auth_url}">', sanitize=False)
-    return None
+    # Store state in a signed cookie for validation - no session storage write
+    response = RedirectResponse(auth_url, status_code=302)
+    response.set_cookie(
+        OAUTH_STATE_COOKIE,
+        sign_oauth_state(state),
+        max_age=OAUTH_STATE_MAX_AGE,
+        path='/auth/google',
+        secure=oauth_service.redirect_uri.startswith('https://'),
+        httponly=True,
+        samesite='lax'
+    )
+    return response
+
+
+def sign_oauth_state(state: str) -> str:
+    """
+    Sign an OAuth state for the state cookie
 
+    Args:
+        state: OAuth state parameter
+
+    Returns:
+        Cookie value "<state>.<issued at>.<signature>"
+    """
+    value = f"{state}.{int(time.time())}"
+    return f"{value}.{hash_token(f'{OAUTH_STATE_COOKIE}:{value}', key=TOKEN_HASH_KEY)}"
+
+
+def unsign_oauth_state(cookie: Optional[str]) -> Optional[str]:
+    """
+    Verify a state cookie created by sign_oauth_state()
+
+    Args:
+        cookie: Cookie value
+
+    Returns:
+        OAuth state, None if the cookie is missing, forged or expired
+    """
+    if not cookie or cookie.count('.') < 2:
+        return None
+    value, signature = cookie.rsplit('.', 1)
+    expected = hash_token(f'{OAUTH_STATE_COOKIE}:{value}', key=TOKEN_HASH_KEY)
+    if not hmac.compare_digest(signature, expected):
+        return None
+    state, issued_at = value.rsplit('.', 1)
+    if not issued_at.isdigit() or time.time() - int(issued_at) > OAUTH_STATE_MAX_AGE:
+        return None
+    return state
+
+
+@app.get('/auth/google/callback')
+async def google_auth_callback(
+    request: Request,
+    code: Optional[str] = None,
+    state: Optional[str] = None,
+    error: Optional[str] = None
+):
+    """Handle Google OAuth callback - exchanges the code and redirects"""
+    stored_state = unsign_oauth_state(request.cookies.get(OAUTH_STATE_COOKIE))
+    logger.info(
+        "OAuth callback - code: %s, state: %s...",
+        'yes' if code else 'no', state[:8] if state else 'none'
+    )
+
+    if error:
+        logger.error(f"OAuth error from Google: {error}")
+        return _oauth_failure('denied')
+
+    if not code:
+        logger.error("No authorization code in callback")
+        return _oauth_failure('no_code')
+
+    oauth_service = get_oauth_service()
+    if not oauth_service:
+        return _oauth_failure('not_configured')
+
+    # Validate state against the signed cookie - a missing, forged or expired
+    # cookie fails the check as well
+    if (
+        not state
+        or stored_state is None
+        or not hmac.compare_digest(state.encode(), stored_state.encode())
+    ):
+        logger.error("OAuth state mismatch")
+        return _oauth_failure('state')
+
+    try:
+        # Exchange code for user info
+        user_info = await oauth_service.authenticate(code)
+
+        # Login or create user - off the event loop, it runs several queries
+        def login_user():
+            with get_db_context() as db:
+                return login_or_create_oauth_user(
+                    db=db,
+                    google_id=user_info.google_id,
+                    email=user_info.email,
+                    full_name=user_info.name,
+                    avatar_url=user_info.picture,
+                    refresh_token=user_info.refresh_token,
+                )
+
+        user_dto, token = await asyncio.to_thread(login_user)
+    except OAuthDomainNotAllowedError as e:
+        logger.warning("OAuth domain not allowed: %s", e)
+        return _oauth_failure('domain')
+    except InactiveUserError as e:
+        logger.warning("OAuth inactive user: %s", e)
+        return _oauth_failure('inactive')
+    except OAuthError as e:
+        logger.error(f"OAuth error: {e}")
+        return _oauth_failure('failed')
+    except Exception as e:
+        logger.error(f"Unexpected OAuth error: {e}")
+        return _oauth_failure('unexpected')
+
+    set_session_token(token)
+    logger.info("OAuth login successful for %s", user_dto.email)
+
+    # The dashboard shows the welcome notification for oauth_login
+    response = RedirectResponse(f"{DASHBOARD_URL}?oauth_login=1", status_code=302)
+    response.delete_cookie(OAUTH_STATE_COOKIE, path='/auth/google')
+    return response
 
-@ui.page('/auth/google/callback')
-def google_auth_callback():
-    """Handle Google OAuth callback - shows processing page"""
-    # Show a processing page that will handle the OAuth callback via JavaScript
-    with ui.column().classes('w-full h-screen items-center justify-center'):
-        ui.spinner(size='xl')
-        ui.label('Anmeldung wird verarbeitet...').classes('text-h6 mt-4')
-        
-        # Process OAuth callback
-        async def process_oauth():
-            from .services.oauth_service import get_oauth_service, OAuthError
-            from .auth import login_or_create_oauth_user, OAuthDomainNotAllowedError, InactiveUserError
-            
-            try:
-                # Get query params via JavaScript
-                result = await ui.run_javascript('''
-                    const params = new URLSearchParams(window.location.search);
-                    return {
-                        code: params.get('code'),
-                        state: params.get('state'),
-                        error: params.get('error')
-                    };
-                ''', timeout=5.0)
-                
-                code = result.get('code') if result else None
-                state = result.get('state') if result else None
-                error = result.get('error') if result else None
-                
-                logger.info(f"OAuth callback - code: {'yes' if code else 'no'}, state: {state[:8] if state else 'none'}...")
-                
-                if error:
-                    logger.error(f"OAuth error from Google: {error}")
-                    ui.notify(f'Google Anmeldung fehlgeschlagen: {error}', type='negative')
-                    ui.navigate.to('/login')
-                    return None
-                
-                if not code:
-                    logger.error("No authorization code in callback")
-                    ui.notify('Keine Autorisierung erhalten', type='negative')
-                    ui.navigate.to('/login')
-                    return None
-                
-                oauth_service = get_oauth_service()
-                if not oauth_service:
-                    ui.notify('Google OAuth ist nicht konfiguriert', type='negative')
-                    ui.navigate.to('/login')
-                    return None
-                
-                # Validate state
-                stored_state = app.storage.user.get('oauth_state')
-                if state and stored_state and state != stored_state:
-                    if not oauth_service.validate_state(state):
-                        logger.error("OAuth state mismatch")
-                        ui.notify('Sicherheitsfehler. Bitte erneut versuchen.', type='negative')
-                        ui.navigate.to('/login')
-                        return None
-                
-                app.storage.user.pop('oauth_state', None)
-                
-                # Exchange code for user info
-                user_info = await oauth_service.authenticate(code)
-                
-                # Login or create user
-                db = get_db()
-                try:
-                    user_dto, token = login_or_create_oauth_user(
-                        db=db,
-                        google_id=user_info.google_id,
-                        email=user_info.email,
-                        full_name=user_info.name,
-                        avatar_url=user_info.picture,
-                        refresh_token=user_info.refresh_token,
-                    )
-                    
-                    app.storage.user[SESSION_TOKEN_KEY] = token
-                    logger.info(f"OAuth login successful for {user_dto.email}")
-                    
-                    ui.notify(f'Willkommen, {user_dto.full_name or user_dto.username}!', type='positive')
-                    ui.navigate.to('/dashboard')
-                    
-                finally:
-                    db.close()
-                    
-            except OAuthDomainNotAllowedError as e:
-                logger.warning(f"OAuth domain not allowed: {e}")
-                ui.notify(str(e), type='negative')
-                ui.navigate.to('/login')
-            except InactiveUserError as e:
-                logger.warning(f"OAuth inactive user: {e}")
-                ui.notify(str(e), type='negative')
-                ui.navigate.to('/login')
-            except OAuthError as e:
-                logger.error(f"OAuth error: {e}")
-                ui.notify(f'Anmeldung fehlgeschlagen: {str(e)}', type='negative')
-                ui.navigate.to('/login')
-            except Exception as e:
-                logger.error(f"Unexpected OAuth error: {e}")
-                ui.notify('Ein unerwarteter Fehler ist aufgetreten', type='negative')
-                ui.navigate.to('/login')
-        
-        # Start processing after page is connected
-        ui.timer(0.1, process_oauth, once=True)
-    return None
+
+def _oauth_failure(reason: str) -> RedirectResponse:
+    """Redirect a failed OAuth login back to the login page"""
+    response = RedirectResponse(f"{LOGIN_URL}?oauth_error={reason}", status_code=302)
+    response.delete_cookie(OAUTH_STATE_COOKIE, path='/auth/google')
+    return response
 
 
 @ui.page('/logout')
 def logout_page():
     """Logout and redirect to login"""
-    from .auth import logout_user
-
-    # Get user before clearing token
-    user = get_current_user()
-
     # Clear session token
-    app.storage.user.pop(SESSION_TOKEN_KEY, None)
+    token = clear_session_token()
+    if token:
+        forget_token(token)
 
-    # Log the logout
-    if user:
+        # Queue the logout audit entry - user id and name come from the token
+        # claims (expired tokens still identify the user), so no DB access here
         try:
-            db = get_db()
-            logout_user(db, user.id)
-            db.close()
+            payload = validate_jwt_token(token, verify_exp=False)
+            record_logout(get_token_user_id(payload), payload.get('username'))
         except Exception as e:
             logger.error(f"Error logging logout: {e}")
 
     ui.notify('Logged out successfully', type='positive')
-    ui.navigate.to('/login')
+    ui.navigate.to(LOGIN_URL)
     return None
 
 
+@app.get('/healthz')
+def healthz():
+    """Health check endpoint exposing database pool statistics"""
+    return {'status': 'ok', 'db_pool': get_pool_status()}
+
+
 def init_app():
     """Initialize the application"""
     try:
@@ -536,15 +660,18 @@ def init_app():
 
         # Create admin user if not exists
         logger.info("Checking for admin user...")
-        db = get_db()
-        create_admin_user(db)
-        db.close()
+        with get_db_context() as db:
+            create_admin_user(db)
+
+        # Load the OAuth service once so the first login doesn't pay for it
+        get_oauth_service()
         
         # Register VS Code Server API router
         try:
-            from .api.vscode_proxy import router as vscode_router
-            app.add_api_route("/api/vscode/open", vscode_router.routes[0].endpoint, methods=["GET"])
-            app.add_api_route("/api/vscode/status", vscode_router.routes[1].endpoint, methods=["GET"])
+            if vscode_router is None:
+                raise vscode_import_error
+            # The router declares the /vscode prefix itself
+            app.include_router(vscode_router, prefix="/api")
             logger.info("VS Code Server API routes registered")
         except Exception as e:
             logger.warning(f"Could not register VS Code API routes: {e}")
@@ -558,21 +685,35 @@ def init_app():
 
 async def startup_scheduler():
     """Start the cronjob scheduler on app startup"""
+    from .services.cronjob_scheduler import get_scheduler
+
     logger.info("🚀 Starting cronjob scheduler...")
     scheduler = get_scheduler()
-    import asyncio
-    asyncio.create_task(scheduler.start())
+    # Keep a reference, the event loop only holds tasks weakly
+    app.state.scheduler_task = asyncio.create_task(scheduler.start(), name='cronjob-scheduler')
     logger.info("✓ Cronjob scheduler task created")
 
 
+async def shutdown_scheduler():
+    """Stop the cronjob scheduler on app shutdown"""
+    from .services.cronjob_scheduler import get_scheduler
+
+    get_scheduler().stop()
+    task = getattr(app.state, 'scheduler_task', None)
+    if task is not None:
+        task.cancel()
+        app.state.scheduler_task = None
+
+
 def main():
     """Main application entry point"""
     try:
         # Initialize application
         init_app()
 
-        # Register startup handler for scheduler
+        # Register startup and shutdown handlers for scheduler
         app.on_startup(startup_scheduler)
+        app.on_shutdown(shutdown_scheduler)
 
         # Configure NiceGUI
         ui.run(
@@ -581,7 +722,7 @@ def main():
             port=APP_PORT,
             reload=False,  # Disabled to prevent connection loss during operations
             show=False,
-            storage_secret=os.getenv('SESSION_SECRET', 'change-this-secret-in-production')
+            storage_secret=SESSION_SECRET
         )
 
     except KeyboardInterrupt:
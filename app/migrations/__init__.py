@@ -1 +1,28 @@
 # Migrations package for Ninox2Git WebApp
+from sqlalchemy import text
+
+
+def missing_columns(conn, table: str, names) -> list:
+    """
+    Get the columns of a table that don't exist yet
+
+    Asks information_schema for just these names in one query instead of
+    reflecting every column of the table via Inspector.get_columns().
+
+    Args:
+        conn: Database connection
+        table: Table name
+        names: Column names to check
+
+    Returns:
+        Names from `names` that are missing, in their original order
+    """
+    existing = {row[0] for row in conn.execute(
+        text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table "
+            "AND column_name = ANY(:names)"
+        ),
+        {'table': table, 'names': list(names)}
+    )}
+    return [name for name in names if name not in existing]
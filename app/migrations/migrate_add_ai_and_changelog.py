@@ -10,19 +10,25 @@ Run this script after updating the models to create the new tables.
 """
 import sys
 import os
+from functools import lru_cache
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from sqlalchemy import inspect, text
-from app.database import engine, get_db
+from sqlalchemy import insert, inspect, text
+from app.database import engine, get_db_context
 from app.models.base import Base
 from app.models.ai_config import AIConfig, AIProvider, DEFAULT_MODELS
 from app.models.changelog import ChangeLog
 
 
+@lru_cache(maxsize=None)
+def _table_names() -> frozenset:
+    """Table names of the database, introspected once per run"""
+    return frozenset(inspect(engine).get_table_names())
+
+
 def table_exists(table_name: str) -> bool:
-    """Check if a table exists in the database"""
-    inspector = inspect(engine)
-    return table_name in inspector.get_table_names()
+    """Check if a table existed in the database when the migration started"""
+    return table_name in _table_names()
 
 
 def create_tables():
@@ -50,44 +56,43 @@ def create_tables():
 
 def initialize_default_ai_configs():
     """Initialize default AI provider configurations"""
-    db = get_db()
-    
     try:
-        # Check if any AI configs exist
-        existing = db.query(AIConfig).count()
-        if existing > 0:
-            print(f"  AI configurations already exist ({existing} entries), skipping initialization")
-            return
+        with get_db_context() as db:
+            # Check if any AI configs exist
+            existing = db.query(AIConfig).count()
+            if existing > 0:
+                print(f"  AI configurations already exist ({existing} entries), skipping initialization")
+                return
         
-        # Create default configurations for each provider
-        providers = [
-            (AIProvider.CLAUDE, True),   # Claude as default
-            (AIProvider.OPENAI, False),
-            (AIProvider.GEMINI, False),
-        ]
+            # Create default configurations for each provider
+            providers = [
+                (AIProvider.CLAUDE, True),   # Claude as default
+                (AIProvider.OPENAI, False),
+                (AIProvider.GEMINI, False),
+            ]
         
-        for provider, is_default in providers:
-            config = AIConfig(
-                provider=provider.value,
-                model=DEFAULT_MODELS[provider],
-                is_default=is_default,
-                is_active=True,
-                max_tokens=1000,
-                temperature=0.3,
-                api_key_encrypted=None,  # No API key yet
-            )
-            db.add(config)
-            print(f"  Created AI config for {provider.value} (default: {is_default})")
+            # One multi-row INSERT for all providers
+            db.execute(insert(AIConfig), [
+                {
+                    'provider': provider.value,
+                    'model': DEFAULT_MODELS[provider],
+                    'is_default': is_default,
+                    'is_active': True,
+                    'max_tokens': 1000,
+                    'temperature': 0.3,
+                    'api_key_encrypted': None,  # No API key yet
+                }
+                for provider, is_default in providers
+            ])
+            for provider, is_default in providers:
+                print(f"  Created AI config for {provider.value} (default: {is_default})")
         
-        db.commit()
-        print("  Initialized default AI provider configurations")
+            db.commit()
+            print("  Initialized default AI provider configurations")
         
     except Exception as e:
         print(f"  Error initializing AI configs: {str(e)}")
-        db.rollback()
         raise
-    finally:
-        db.close()
 
 
 def run_migration():
@@ -10,17 +10,22 @@ Run this script to add the new columns to the existing changelogs table.
 """
 import sys
 import os
+from functools import lru_cache
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from sqlalchemy import inspect, text, Integer
 from app.database import engine
 
 
+@lru_cache(maxsize=None)
+def _column_names(table_name: str) -> frozenset:
+    """Column names of a table, introspected once per run"""
+    return frozenset(col['name'] for col in inspect(engine).get_columns(table_name))
+
+
 def column_exists(table_name: str, column_name: str) -> bool:
-    """Check if a column exists in a table"""
-    inspector = inspect(engine)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
+    """Check if a column existed in a table when the migration started"""
+    return column_name in _column_names(table_name)
 
 
 def add_token_columns():
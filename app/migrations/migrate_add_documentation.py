@@ -10,7 +10,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from sqlalchemy import inspect, text
+from sqlalchemy import inspect
 from app.database import engine
 
 
@@ -27,7 +27,8 @@ def create_documentations_table():
         return False
     
     with engine.connect() as conn:
-        conn.execute(text("""
+        # Table and indexes in one round-trip
+        conn.exec_driver_sql("""
             CREATE TABLE documentations (
                 id SERIAL PRIMARY KEY,
                 database_id INTEGER NOT NULL REFERENCES databases(id) ON DELETE CASCADE,
@@ -41,18 +42,12 @@ def create_documentations_table():
                 github_commit_sha VARCHAR(40),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
-        
-        # Create index on database_id for faster lookups
-        conn.execute(text("""
-            CREATE INDEX idx_documentations_database_id ON documentations(database_id)
-        """))
-        
-        # Create index on generated_at for ordering
-        conn.execute(text("""
-            CREATE INDEX idx_documentations_generated_at ON documentations(generated_at DESC)
-        """))
+            );
+            -- Index on database_id for faster lookups
+            CREATE INDEX idx_documentations_database_id ON documentations(database_id);
+            -- Index on generated_at for ordering
+            CREATE INDEX idx_documentations_generated_at ON documentations(generated_at DESC);
+        """)
         
         conn.commit()
         print("  Created table: documentations")
@@ -8,7 +8,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.database import get_db
+from sqlalchemy import or_, select, text, update
+
+from app.database import get_db_context
 from app.models.server import Server
 from app.models.user import User
 
@@ -18,64 +20,80 @@ def migrate_github_config():
     Migrate GitHub configuration from servers to users.
     Takes the first server's GitHub config for each user and moves it to the user model.
     """
-    db = get_db()
+    has_github = or_(
+        Server.github_token_encrypted.is_not(None),
+        Server.github_organization.is_not(None),
+        Server.github_repo_name.is_not(None)
+    )
 
     try:
-        # Get all servers with GitHub configuration
-        servers_with_github = db.query(Server).filter(
-            (Server.github_token_encrypted != None) |
-            (Server.github_organization != None) |
-            (Server.github_repo_name != None)
-        ).all()
+        with get_db_context() as db:
+            # First server with GitHub configuration per user - DISTINCT ON lets
+            # PostgreSQL drop the other servers instead of sending them over
+            first_servers = db.execute(text("""
+                SELECT DISTINCT ON (user_id)
+                    user_id, name, github_token_encrypted, github_organization, github_repo_name
+                FROM servers
+                WHERE github_token_encrypted IS NOT NULL
+                   OR github_organization IS NOT NULL
+                   OR github_repo_name IS NOT NULL
+                ORDER BY user_id, id
+            """)).all()
 
-        if not servers_with_github:
-            print("No servers with GitHub configuration found. Migration not needed.")
-            return
+            if not first_servers:
+                print("No servers with GitHub configuration found. Migration not needed.")
+                return
 
-        print(f"Found {len(servers_with_github)} servers with GitHub configuration")
+            print(f"Found GitHub configuration on servers of {len(first_servers)} users")
 
-        # Group servers by user
-        user_configs = {}
-        for server in servers_with_github:
-            if server.user_id not in user_configs:
-                user_configs[server.user_id] = server
+            # Load all affected users with one query
+            users = {
+                user.id: user
+                for user in db.execute(
+                    select(User.id, User.username, User.github_token_encrypted)
+                    .where(User.id.in_([server.user_id for server in first_servers]))
+                )
+            }
 
-        # Migrate configuration to users
-        migrated_count = 0
-        for user_id, server in user_configs.items():
-            user = db.query(User).filter(User.id == user_id).first()
-            if user:
-                # Only migrate if user doesn't already have GitHub config
-                if not user.github_token_encrypted:
-                    print(f"Migrating GitHub config for user {user.username} from server {server.name}")
-                    user.github_token_encrypted = server.github_token_encrypted
-                    user.github_organization = server.github_organization
-                    user.github_default_repo = server.github_repo_name
-                    migrated_count += 1
-                else:
-                    print(f"User {user.username} already has GitHub configuration, skipping")
+            # Migrate configuration to users
+            user_updates = []
+            for server in first_servers:
+                user = users.get(server.user_id)
+                if user:
+                    # Only migrate if user doesn't already have GitHub config
+                    if not user.github_token_encrypted:
+                        print(f"Migrating GitHub config for user {user.username} from server {server.name}")
+                        user_updates.append({
+                            'id': user.id,
+                            'github_token_encrypted': server.github_token_encrypted,
+                            'github_organization': server.github_organization,
+                            'github_default_repo': server.github_repo_name,
+                        })
+                    else:
+                        print(f"User {user.username} already has GitHub configuration, skipping")
+            migrated_count = len(user_updates)
 
-        if migrated_count > 0:
-            db.commit()
-            print(f"Successfully migrated GitHub configuration for {migrated_count} users")
+            if migrated_count > 0:
+                # Bulk UPDATE by primary key - one executemany for all users
+                db.execute(update(User), user_updates)
+                db.commit()
+                print(f"Successfully migrated GitHub configuration for {migrated_count} users")
 
-            # Clear GitHub config from servers
-            for server in servers_with_github:
-                server.github_token_encrypted = None
-                server.github_organization = None
-                server.github_repo_name = None
+                # Clear GitHub config from servers
+                db.execute(
+                    update(Server)
+                    .where(has_github)
+                    .values(github_token_encrypted=None, github_organization=None, github_repo_name=None)
+                )
 
-            db.commit()
-            print("Cleared GitHub configuration from servers (kept for backward compatibility)")
-        else:
-            print("No users needed GitHub configuration migration")
+                db.commit()
+                print("Cleared GitHub configuration from servers (kept for backward compatibility)")
+            else:
+                print("No users needed GitHub configuration migration")
 
     except Exception as e:
         print(f"Error during migration: {str(e)}")
-        db.rollback()
         raise
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
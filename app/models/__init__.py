@@ -1,43 +1,65 @@
+"""
+Database models
+
+Model modules are imported on first attribute access (PEP 562), so importing
+one model doesn't load all of them. Relationships refer to their targets by
+class name, so every model is still registered before SQLAlchemy configures
+the mappers, and load_all_models() does the same for metadata-wide operations
+like create_all().
+"""
+import importlib
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
 from .base import Base
-from .user import User
-from .server import Server
-from .team import Team
-from .database import Database
-from .database_dependency import DatabaseDependency
-from .audit_log import AuditLog
-from .password_reset import PasswordReset
-from .cronjob import Cronjob, CronjobType, IntervalUnit
-from .smtp_config import SmtpConfig
-from .user_preference import UserPreference
-from .ai_config import AIConfig, AIProvider, AVAILABLE_MODELS, DEFAULT_MODELS
-from .changelog import ChangeLog
-from .documentation import Documentation
-from .oauth_config import OAuthConfig
-from .prompt_template import PromptTemplate, PromptType
-from .bookstack_config import BookstackConfig
-
-__all__ = [
-    'Base',
-    'User',
-    'Server',
-    'Team',
-    'Database',
-    'DatabaseDependency',
-    'AuditLog',
-    'PasswordReset',
-    'Cronjob',
-    'CronjobType',
-    'IntervalUnit',
-    'SmtpConfig',
-    'UserPreference',
-    'AIConfig',
-    'AIProvider',
-    'AVAILABLE_MODELS',
-    'DEFAULT_MODELS',
-    'ChangeLog',
-    'Documentation',
-    'OAuthConfig',
-    'PromptTemplate',
-    'PromptType',
-    'BookstackConfig',
-]
+
+# Public name -> module defining it
+_LAZY = {
+    'User': '.user',
+    'Server': '.server',
+    'Team': '.team',
+    'Database': '.database',
+    'DatabaseDependency': '.database_dependency',
+    'AuditLog': '.audit_log',
+    'PasswordReset': '.password_reset',
+    'Cronjob': '.cronjob',
+    'CronjobType': '.cronjob',
+    'IntervalUnit': '.cronjob',
+    'SmtpConfig': '.smtp_config',
+    'UserPreference': '.user_preference',
+    'AIConfig': '.ai_config',
+    'AIProvider': '.ai_config',
+    'AVAILABLE_MODELS': '.ai_config',
+    'DEFAULT_MODELS': '.ai_config',
+    'ChangeLog': '.changelog',
+    'Documentation': '.documentation',
+    'OAuthConfig': '.oauth_config',
+    'PromptTemplate': '.prompt_template',
+    'PromptType': '.prompt_template',
+    'BookstackConfig': '.bookstack_config',
+}
+
+__all__ = ['Base', *_LAZY]
+
+
+def __getattr__(name: str):
+    """Import a model on first access"""
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def load_all_models():
+    """Import all model modules so every table and mapper is registered"""
+    for module in dict.fromkeys(_LAZY.values()):
+        importlib.import_module(module, __name__)
+
+
+@event.listens_for(Mapper, 'before_configured')
+def _load_models_before_configure():
+    """Register all models before string relationship targets are resolved"""
+    load_all_models()
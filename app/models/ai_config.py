@@ -27,9 +27,10 @@ DEFAULT_MODELS = {
     AIProvider.GEMINI: "gemini-2.5-flash",
 }
 
-# Available models per provider (sorted by capability: newest/best first)
+# Available models per provider (sorted by capability: newest/best first).
+# Immutable tuples - ui.select needs a list, so callers pass a copy.
 AVAILABLE_MODELS = {
-    AIProvider.CLAUDE: [
+    AIProvider.CLAUDE: (
         # Claude 4.5 Familie (aktuell)
         "claude-opus-4-5",              # Höchste Qualität
         "claude-sonnet-4-5",            # Bestes Preis-Leistungs-Verhältnis
@@ -43,8 +44,8 @@ AVAILABLE_MODELS = {
         "claude-3-7-sonnet-latest",     # Sonnet 3.7
         # Claude 3.5 Familie (legacy)
         "claude-3-5-haiku-latest",      # Haiku 3.5
-    ],
-    AIProvider.OPENAI: [
+    ),
+    AIProvider.OPENAI: (
         # GPT-5 Familie (aktuell)
         "gpt-5",                        # Flagship
         "gpt-5-mini",                   # Schneller
@@ -63,8 +64,8 @@ AVAILABLE_MODELS = {
         "o4-mini",                      # Reasoning mini
         "o3",                           # Reasoning
         "o3-mini",                      # Reasoning mini
-    ],
-    AIProvider.GEMINI: [
+    ),
+    AIProvider.GEMINI: (
         # Gemini 3 Familie (Preview)
         "gemini-3-pro-preview",         # Gemini 3 Pro (Preview)
         # Gemini 2.5 Familie (aktuell)
@@ -75,9 +76,17 @@ AVAILABLE_MODELS = {
         # Gemini 2.0 Familie
         "gemini-2.0-flash",             # Flash 2.0
         "gemini-2.0-flash-lite",        # Flash 2.0 Lite
-    ],
+    ),
 }
 
+# Lookups by the provider value stored in AIConfig.provider
+_DISPLAY_NAMES = {
+    AIProvider.CLAUDE.value: "Claude (Anthropic)",
+    AIProvider.OPENAI.value: "OpenAI",
+    AIProvider.GEMINI.value: "Google Gemini",
+}
+_DEFAULT_MODEL_BY_VALUE = {provider.value: model for provider, model in DEFAULT_MODELS.items()}
+
 
 class AIConfig(Base, TimestampMixin):
     """
@@ -137,37 +146,23 @@ class AIConfig(Base, TimestampMixin):
     @property
     def display_name(self) -> str:
         """Human-readable provider name"""
-        names = {
-            AIProvider.CLAUDE.value: "Claude (Anthropic)",
-            AIProvider.OPENAI.value: "OpenAI",
-            AIProvider.GEMINI.value: "Google Gemini",
-        }
-        return names.get(self.provider, self.provider)
+        return _DISPLAY_NAMES.get(self.provider, self.provider)
     
     @classmethod
     def get_provider_choices(cls) -> list:
         """Get list of available providers for UI dropdowns"""
-        return [
-            {"value": AIProvider.CLAUDE.value, "label": "Claude (Anthropic)"},
-            {"value": AIProvider.OPENAI.value, "label": "OpenAI"},
-            {"value": AIProvider.GEMINI.value, "label": "Google Gemini"},
-        ]
+        return [{"value": value, "label": label} for value, label in _DISPLAY_NAMES.items()]
     
     @classmethod
     def get_model_choices(cls, provider: str) -> list:
         """Get list of available models for a provider"""
         try:
             provider_enum = AIProvider(provider)
-            return AVAILABLE_MODELS.get(provider_enum, [])
+            return list(AVAILABLE_MODELS.get(provider_enum, ()))
         except ValueError:
             return []
     
     @classmethod
     def get_default_model(cls, provider: str) -> str:
         """Get the default model for a provider"""
-        try:
-            provider_enum = AIProvider(provider)
-            model = DEFAULT_MODELS.get(provider_enum)
-            return model if model else ""
-        except ValueError:
-            return ""
+        return _DEFAULT_MODEL_BY_VALUE.get(provider, "")
@@ -130,9 +130,9 @@ class NinoxCLIService:
                 env={**os.environ, 'NO_COLOR': '1'}  # Disable color output
             )
             
-            logger.debug(f"Command stdout: {result.stdout[:500] if result.stdout else 'empty'}")
+            logger.debug("Command stdout: %.500s", result.stdout or 'empty')
             if result.stderr:
-                logger.debug(f"Command stderr: {result.stderr[:500]}")
+                logger.debug("Command stderr: %.500s", result.stderr)
             
             return result.returncode, result.stdout, result.stderr
             
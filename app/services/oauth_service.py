@@ -5,11 +5,15 @@ Handles the OAuth2 flow with Google
 import os
 import logging
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 from urllib.parse import urlencode
 
 import httpx
+import jwt
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +21,28 @@ logger = logging.getLogger(__name__)
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Google's signing keys rotate rarely, keep them for an hour
+GOOGLE_JWKS_TTL = 3600
+
+# Cached signing keys by key id and their expiry timestamp
+_jwks_cache: Dict[str, jwt.PyJWK] = {}
+_jwks_expires_at = 0.0
+
+# How long the OAuth service built from the database config is reused (seconds)
+OAUTH_SERVICE_CACHE_TTL = float(os.getenv('OAUTH_SERVICE_CACHE_TTL', '60'))
+
+# Upper bound for pending OAuth states kept in memory
+MAX_PENDING_STATES = 1000
+
+# Cached OAuth service: (monotonic expiry, service or None if not configured)
+_oauth_service_cache: Optional[Tuple[float, Optional["OAuthService"]]] = None
+_oauth_service_cache_lock = threading.Lock()
+
+# Shared HTTP client - keeps connections to Google's endpoints alive
+_http_client: Optional[httpx.AsyncClient] = None
 
 # Basic scopes for authentication
 GOOGLE_SCOPES_BASIC = [
@@ -65,6 +91,59 @@ class OAuthNotConfiguredError(OAuthError):
     pass
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for requests to Google"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient()
+    return _http_client
+
+
+async def _fetch_google_jwks() -> Dict[str, jwt.PyJWK]:
+    """
+    Download Google's current ID token signing keys
+
+    Returns:
+        Dict mapping key id to signing key
+    """
+    response = await get_http_client().get(GOOGLE_CERTS_URL)
+
+    if response.status_code != 200:
+        logger.error(f"Failed to get Google signing keys: {response.text}")
+        raise OAuthError(f"Failed to get Google signing keys: {response.status_code}")
+
+    jwk_set = jwt.PyJWKSet.from_dict(response.json())
+    return {key.key_id: key for key in jwk_set.keys}
+
+
+async def get_google_signing_key(key_id: str) -> jwt.PyJWK:
+    """
+    Get a Google signing key from the in-memory JWKS cache
+
+    The cache is refreshed when it expires or when an unknown key id shows up
+    (key rotation).
+
+    Args:
+        key_id: Key id ("kid") from the ID token header
+
+    Returns:
+        Signing key
+
+    Raises:
+        OAuthError: If the key is unknown or the keys cannot be fetched
+    """
+    global _jwks_cache, _jwks_expires_at
+
+    if time.monotonic() >= _jwks_expires_at or key_id not in _jwks_cache:
+        _jwks_cache = await _fetch_google_jwks()
+        _jwks_expires_at = time.monotonic() + GOOGLE_JWKS_TTL
+
+    key = _jwks_cache.get(key_id)
+    if key is None:
+        raise OAuthError(f"Unknown ID token signing key: {key_id}")
+    return key
+
+
 class OAuthService:
     """Service for handling Google OAuth2 flow"""
     
@@ -81,8 +160,9 @@ class OAuthService:
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
         
-        # In-memory state storage (in production, use Redis or DB)
-        self._states: Dict[str, bool] = {}
+        # In-memory state storage (in production, use Redis or DB), oldest first
+        self._states: OrderedDict[str, bool] = OrderedDict()
+        self._states_lock = threading.Lock()
     
     def generate_auth_url(self, state: Optional[str] = None, include_drive: bool = False) -> Tuple[str, str]:
         """
@@ -98,8 +178,12 @@ class OAuthService:
         if not state:
             state = secrets.token_urlsafe(32)
         
-        # Store state for validation
-        self._states[state] = True
+        # Store state for validation - when full, only the oldest pending
+        # state is dropped, so a burst of new logins can't void the others
+        with self._states_lock:
+            if len(self._states) >= MAX_PENDING_STATES:
+                self._states.popitem(last=False)
+            self._states[state] = True
         
         # Select scopes based on whether Drive is enabled
         scopes = GOOGLE_SCOPES_WITH_DRIVE if include_drive else GOOGLE_SCOPES_BASIC
@@ -129,10 +213,9 @@ class OAuthService:
         Returns:
             True if valid, False otherwise
         """
-        if state in self._states:
-            del self._states[state]  # One-time use
-            return True
-        return False
+        with self._states_lock:
+            # One-time use
+            return self._states.pop(state, None) is not None
     
     async def exchange_code_for_tokens(self, code: str) -> Dict[str, Any]:
         """
@@ -152,16 +235,15 @@ class OAuthService:
             "redirect_uri": self.redirect_uri,
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(GOOGLE_TOKEN_URL, data=data)
-            
-            if response.status_code != 200:
-                logger.error(f"Token exchange failed: {response.text}")
-                raise OAuthError(f"Token exchange failed: {response.status_code}")
-            
-            tokens = response.json()
-            logger.info("Successfully exchanged code for tokens")
-            return tokens
+        response = await get_http_client().post(GOOGLE_TOKEN_URL, data=data)
+        
+        if response.status_code != 200:
+            logger.error(f"Token exchange failed: {response.text}")
+            raise OAuthError(f"Token exchange failed: {response.status_code}")
+        
+        tokens = response.json()
+        logger.info("Successfully exchanged code for tokens")
+        return tokens
     
     async def get_user_info(self, access_token: str) -> GoogleUserInfo:
         """
@@ -175,31 +257,74 @@ class OAuthService:
         """
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(GOOGLE_USERINFO_URL, headers=headers)
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get user info: {response.text}")
-                raise OAuthError(f"Failed to get user info: {response.status_code}")
-            
-            data = response.json()
-            
-            user_info = GoogleUserInfo(
-                google_id=data.get("id"),
-                email=data.get("email"),
-                name=data.get("name", ""),
-                given_name=data.get("given_name"),
-                family_name=data.get("family_name"),
-                picture=data.get("picture"),
-                verified_email=data.get("verified_email", False),
-            )
-            
-            logger.info(f"Got user info for: {user_info.email}")
-            return user_info
+        response = await get_http_client().get(GOOGLE_USERINFO_URL, headers=headers)
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to get user info: {response.text}")
+            raise OAuthError(f"Failed to get user info: {response.status_code}")
+        
+        data = response.json()
+        
+        user_info = GoogleUserInfo(
+            google_id=data.get("id"),
+            email=data.get("email"),
+            name=data.get("name", ""),
+            given_name=data.get("given_name"),
+            family_name=data.get("family_name"),
+            picture=data.get("picture"),
+            verified_email=data.get("verified_email", False),
+        )
+        
+        logger.info(f"Got user info for: {user_info.email}")
+        return user_info
     
+    async def verify_id_token(self, id_token: str) -> GoogleUserInfo:
+        """
+        Verify a Google ID token locally and read the user info from its claims
+
+        Args:
+            id_token: ID token from the token response
+
+        Returns:
+            GoogleUserInfo object
+
+        Raises:
+            OAuthError: If the token is invalid
+        """
+        try:
+            header = jwt.get_unverified_header(id_token)
+            key = await get_google_signing_key(header.get("kid"))
+            claims = jwt.decode(
+                id_token,
+                key.key,
+                algorithms=["RS256"],
+                audience=self.client_id,
+            )
+        except jwt.PyJWTError as e:
+            raise OAuthError(f"Invalid ID token: {e}")
+
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise OAuthError(f"Invalid ID token issuer: {claims.get('iss')}")
+
+        user_info = GoogleUserInfo(
+            google_id=claims.get("sub"),
+            email=claims.get("email"),
+            name=claims.get("name", ""),
+            given_name=claims.get("given_name"),
+            family_name=claims.get("family_name"),
+            picture=claims.get("picture"),
+            verified_email=claims.get("email_verified", False),
+        )
+
+        logger.info(f"Verified ID token for: {user_info.email}")
+        return user_info
+
     async def authenticate(self, code: str) -> GoogleUserInfo:
         """
         Complete authentication flow: exchange code and get user info
+
+        The user info is taken from the verified ID token. The userinfo
+        endpoint is only called if the response has no ID token.
         
         Args:
             code: Authorization code from callback
@@ -209,12 +334,16 @@ class OAuthService:
         """
         tokens = await self.exchange_code_for_tokens(code)
         access_token = tokens.get("access_token")
+        id_token = tokens.get("id_token")
         refresh_token = tokens.get("refresh_token")  # Only returned on first auth with consent
         
         if not access_token:
             raise OAuthError("No access token in response")
         
-        user_info = await self.get_user_info(access_token)
+        if id_token:
+            user_info = await self.verify_id_token(id_token)
+        else:
+            user_info = await self.get_user_info(access_token)
         user_info.refresh_token = refresh_token
         
         logger.info(f"Authentication complete, refresh_token={'yes' if refresh_token else 'no'}")
@@ -225,9 +354,34 @@ def get_oauth_service() -> Optional[OAuthService]:
     """
     Get OAuth service instance if configured
     
+    The instance is shared and rebuilt from the database every
+    OAUTH_SERVICE_CACHE_TTL seconds; call invalidate_oauth_service_cache()
+    after changing the OAuth configuration.
+    
     Returns:
         OAuthService instance or None if not configured
     """
+    global _oauth_service_cache
+
+    cached = _oauth_service_cache
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    service = _load_oauth_service()
+    with _oauth_service_cache_lock:
+        _oauth_service_cache = (time.monotonic() + OAUTH_SERVICE_CACHE_TTL, service)
+    return service
+
+
+def invalidate_oauth_service_cache():
+    """Drop the cached OAuth service so the next lookup reads the database"""
+    global _oauth_service_cache
+    with _oauth_service_cache_lock:
+        _oauth_service_cache = None
+
+
+def _load_oauth_service() -> Optional[OAuthService]:
+    """Build the OAuth service from the database config"""
     try:
         from ..database import get_db
         from ..models.oauth_config import OAuthConfig
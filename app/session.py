@@ -0,0 +1,76 @@
+"""
+Session token storage
+
+The JWT of a logged-in browser lives in NiceGUI's per-user storage. Reads go
+through an in-process dict keyed by the browser id (from the signed session
+cookie), so page requests don't touch the persistent storage once the token
+is known. All writes go through this module to keep both in sync.
+"""
+from typing import Optional
+
+from nicegui import app
+
+# Session storage key for JWT token
+SESSION_TOKEN_KEY = 'jwt_token'
+
+# Upper bound for cached browser sessions - the cache is cleared when reached
+SESSION_CACHE_MAX_SIZE = 10000
+
+# Write-through cache: browser id -> JWT token
+_token_by_browser: dict[str, str] = {}
+
+
+def get_session_token() -> Optional[str]:
+    """
+    Get the JWT token of the current browser session
+
+    Returns:
+        JWT token or None if not logged in
+    """
+    browser_id = _browser_id()
+    token = _token_by_browser.get(browser_id) if browser_id else None
+    if token is not None:
+        return token
+
+    token = app.storage.user.get(SESSION_TOKEN_KEY)
+    if token and browser_id:
+        _remember(browser_id, token)
+    return token
+
+
+def set_session_token(token: str):
+    """
+    Store the JWT token of the current browser session
+
+    Args:
+        token: JWT token
+    """
+    app.storage.user[SESSION_TOKEN_KEY] = token
+    browser_id = _browser_id()
+    if browser_id:
+        _remember(browser_id, token)
+
+
+def clear_session_token() -> Optional[str]:
+    """
+    Remove the JWT token of the current browser session
+
+    Returns:
+        Removed JWT token or None
+    """
+    browser_id = _browser_id()
+    if browser_id:
+        _token_by_browser.pop(browser_id, None)
+    return app.storage.user.pop(SESSION_TOKEN_KEY, None)
+
+
+def _browser_id() -> Optional[str]:
+    """Get the id NiceGUI assigns to the current browser"""
+    return app.storage.browser.get('id')
+
+
+def _remember(browser_id: str, token: str):
+    """Cache a token, dropping all entries when the cache is full"""
+    if len(_token_by_browser) >= SESSION_CACHE_MAX_SIZE:
+        _token_by_browser.clear()
+    _token_by_browser[browser_id] = token
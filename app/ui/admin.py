@@ -4,6 +4,7 @@ Admin panel for Ninox2Git
 from nicegui import ui
 from datetime import datetime
 from ..database import get_db
+from ..dto import UserDTO
 from ..models.user import User
 from ..models.server import Server
 from ..models.team import Team
@@ -97,6 +98,7 @@ def render(user):
 def render_oauth_config(user):
     """Render OAuth configuration panel"""
     from ..models.oauth_config import OAuthConfig
+    from ..services.oauth_service import invalidate_oauth_service_cache
     
     encryption = get_encryption_manager()
     
@@ -385,6 +387,7 @@ def render_oauth_config(user):
                                 config.drive_shared_folder_name = drive_folder_input.value.strip() or None
                                 
                                 db.commit()
+                                invalidate_oauth_service_cache()
                                 
                                 Toast.success('OAuth Konfiguration gespeichert!')
                                 
@@ -555,7 +558,7 @@ def show_provider_config_dialog(config: AIConfig, user, reload_callback):
             ui.label('Google AI API-Key von aistudio.google.com').classes('text-caption text-grey-7 mb-4')
         
         # Model selection
-        model_options = AVAILABLE_MODELS.get(AIProvider(config.provider), [])
+        model_options = list(AVAILABLE_MODELS.get(AIProvider(config.provider), ()))
         model_select = ui.select(
             label='Modell',
             options=model_options,
@@ -868,14 +871,9 @@ def render_ninox_docs(user):
         
         ui.separator().classes('my-4')
         
-        # GitHub Settings Info
-        db = get_db()
-        try:
-            db_user = db.query(User).filter(User.id == user.id).first()
-            has_github = db_user and db_user.github_token_encrypted
-            github_org = db_user.github_organization if db_user else None
-        finally:
-            db.close()
+        # GitHub Settings Info - already part of the UserDTO
+        has_github = user.github_token_encrypted
+        github_org = user.github_organization
         
         if not has_github:
             with ui.card().classes('w-full p-4 bg-amber-50'):
@@ -1219,7 +1217,10 @@ def load_users_table(admin_user, container):
 
     db = get_db()
     try:
-        users = db.query(User).order_by(User.created_at.desc()).all()
+        # Load only the UserDTO columns instead of full user rows
+        users = UserDTO.from_models(
+            UserDTO.query(db).order_by(User.created_at.desc()).all()
+        )
 
         with container:
             with ui.card().classes('w-full p-4'):
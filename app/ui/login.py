@@ -1,8 +1,9 @@
 """
 Login and registration page for Ninox2Git
 """
-from nicegui import ui, app
+from nicegui import ui
 from ..database import get_db
+from ..session import set_session_token
 from ..auth import (
     login_user, register_user, generate_password_reset_token,
     InvalidCredentialsError, InactiveUserError, UserExistsError
@@ -11,9 +12,6 @@ from .components import (
     Card, FormField, Toast, PRIMARY_COLOR
 )
 
-# Session storage key
-SESSION_TOKEN_KEY = 'jwt_token'
-
 
 def render():
     """Render the login page"""
@@ -122,7 +120,7 @@ def render_login_form():
                 user_display_name = user.full_name or user.username
 
                 # Store token in session
-                app.storage.user[SESSION_TOKEN_KEY] = token
+                set_session_token(token)
 
                 # Show success message using the stored name
                 Toast.success(f'Welcome back, {user_display_name}!')
@@ -5,6 +5,7 @@ from nicegui import ui
 from ..database import get_db
 from ..models.user import User
 from ..auth import create_audit_log
+from ..auth_cache import forget_user
 from ..utils.encryption import get_encryption_manager
 from .components import (
     NavHeader, Card, FormField, Toast, PRIMARY_COLOR
@@ -69,22 +70,18 @@ def render_account_settings(user):
 
 def render_github_settings(user):
     """Render GitHub configuration section"""
-    # Get current GitHub configuration
-    db = get_db()
-    db_user = db.query(User).filter(User.id == user.id).first()
-
-    # Decrypt GitHub token if exists
+    # Current GitHub configuration - already part of the UserDTO
+    # (the session cache is refreshed when it is saved below)
     encryption = get_encryption_manager()
     github_token = ''
-    if db_user.github_token_encrypted:
+    if user.github_token_encrypted:
         try:
-            github_token = encryption.decrypt(db_user.github_token_encrypted)
+            github_token = encryption.decrypt(user.github_token_encrypted)
         except:
             github_token = ''
 
-    github_org = db_user.github_organization or ''
-    github_repo = db_user.github_default_repo or ''
-    db.close()
+    github_org = user.github_organization or ''
+    github_repo = user.github_default_repo or ''
 
     with Card('GitHub Configuration', 'github'):
         ui.label(
@@ -162,6 +159,7 @@ def render_github_settings(user):
                     db_user.github_default_repo = repo or None
 
                     db.commit()
+                    forget_user(user.id)
 
                     # Create audit log
                     create_audit_log(
@@ -12,6 +12,7 @@ from ..database import get_db
 from ..models.smtp_config import SmtpConfig
 from ..utils.encryption import get_encryption_manager
 from ..auth import create_audit_log
+from ..email_service import invalidate_smtp_config_cache
 from .components import (
     NavHeader, Card, FormField, Toast, ConfirmDialog,
     EmptyState, StatusBadge, format_datetime, PRIMARY_COLOR, SUCCESS_COLOR, WARNING_COLOR
@@ -248,6 +249,7 @@ def show_add_smtp_dialog(user, container=None):
 
                 db.add(config)
                 db.commit()
+                invalidate_smtp_config_cache()
 
                 # Create audit log
                 create_audit_log(
@@ -385,6 +387,7 @@ def show_edit_smtp_dialog(user, config, container):
                 config_obj.use_ssl = use_ssl.value
 
                 db.commit()
+                invalidate_smtp_config_cache()
 
                 # Create audit log
                 create_audit_log(
@@ -570,6 +573,7 @@ def set_active_smtp(user, config, container):
         config_obj.is_active = True
 
         db.commit()
+        invalidate_smtp_config_cache()
 
         # Create audit log
         create_audit_log(
@@ -611,6 +615,7 @@ def confirm_delete_smtp(user, config, container):
             # Delete config
             db.query(SmtpConfig).filter(SmtpConfig.id == config.id).delete()
             db.commit()
+            invalidate_smtp_config_cache()
             db.close()
 
             Toast.success(f'SMTP configuration "{config.name}" deleted successfully!')
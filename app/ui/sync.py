@@ -138,7 +138,7 @@ def find_database_dependencies(team: Team, database_id: str, visited: set = None
     # Check cache first
     cache_key = f"{team.team_id}_{database_id}"
     if cache_key in _dependency_cache:
-        logger.debug(f"Using cached dependencies for {database_id}")
+        logger.debug("Using cached dependencies for %s", database_id)
         return _dependency_cache[cache_key].copy()
 
     if visited is None:
@@ -213,7 +213,7 @@ def find_database_dependencies(team: Team, database_id: str, visited: set = None
                     find_dbid(data)
 
             except Exception as e:
-                logger.debug(f"Could not parse {yaml_file}: {e}")
+                logger.debug("Could not parse %s: %s", yaml_file, e)
                 continue
 
         # Recursively find dependencies of dependencies
@@ -1057,7 +1057,7 @@ def create_database_panel(user, server, team, container):
         """Timer callback - check if still syncing/generating and refresh (skip if dialog open)"""
         # Skip refresh if any dialog is open (global state)
         if _dialog_open_state['count'] > 0:
-            logger.debug(f"Skipping refresh - {_dialog_open_state['count']} dialog(s) open")
+            logger.debug("Skipping refresh - %d dialog(s) open", _dialog_open_state['count'])
             return
 
         sync_manager = get_sync_manager()
@@ -1,5 +1,5 @@
 from .encryption import EncryptionManager
-from .helpers import sanitize_filename, generate_random_token
+from .helpers import sanitize_filename, generate_random_token, hash_token
 from .validators import validate_email, validate_password
 from .ninox_md_generator import generate_markdown_from_backup, generate_markdown
 
@@ -7,6 +7,7 @@ __all__ = [
     'EncryptionManager',
     'sanitize_filename',
     'generate_random_token',
+    'hash_token',
     'validate_email',
     'validate_password',
     'generate_markdown_from_backup',
@@ -3,6 +3,7 @@ Encryption utilities for securing sensitive data like API keys and tokens
 Uses Fernet (symmetric encryption) with a key stored in a secure file
 """
 import os
+import threading
 from pathlib import Path
 from cryptography.fernet import Fernet
 from typing import Optional
@@ -129,11 +130,16 @@ class EncryptionManager:
 
 # Global instance
 _encryption_manager: Optional[EncryptionManager] = None
+_encryption_manager_lock = threading.Lock()
 
 
 def get_encryption_manager() -> EncryptionManager:
     """Get global encryption manager instance"""
     global _encryption_manager
     if _encryption_manager is None:
-        _encryption_manager = EncryptionManager()
+        # Locked so concurrent first calls (e.g. email workers) can't
+        # both create a manager and each generate a key file
+        with _encryption_manager_lock:
+            if _encryption_manager is None:
+                _encryption_manager = EncryptionManager()
     return _encryption_manager
@@ -1,6 +1,7 @@
 """
 Helper utilities for the application
 """
+import hashlib
 import re
 import secrets
 from typing import Optional
@@ -58,6 +59,28 @@ def generate_random_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
+def hash_token(token: str, key: Optional[bytes] = None, digest_size: int = 32) -> str:
+    """
+    Fingerprint a token with BLAKE2b (keyed mode acts as a MAC)
+
+    Used for storing tokens in the database and as cache keys, so the raw
+    token is never persisted or kept as a dictionary key.
+
+    Args:
+        token: Token string to hash
+        key: Optional secret key (max 64 bytes)
+        digest_size: Digest length in bytes (max 64)
+
+    Returns:
+        Hex digest of the token
+    """
+    return hashlib.blake2b(
+        token.encode('utf-8'),
+        key=key or b'',
+        digest_size=digest_size
+    ).hexdigest()
+
+
 def format_bytes(bytes_value: int) -> str:
     """
     Format bytes to human-readable string